@@ -16,7 +16,7 @@ import os
 import argparse
 
 # Import converter modules
-from writers import to_html, to_text, to_epub
+from writers import batch
 
 def main():
     parser = argparse.ArgumentParser(
@@ -44,21 +44,14 @@ Examples:
         print(f"Error: Input file not found: {input_file}")
         sys.exit(1)
     
+    if not output_file.endswith(batch.OUTPUT_EXTENSIONS):
+        print("Error: Output file must have .html, .txt, or .epub extension")
+        sys.exit(1)
+
     try:
-        if output_file.endswith('.html') or output_file.endswith('.xhtml'):
-            to_html.convert(input_file, output_file)
-        
-        elif output_file.endswith('.txt'):
-            width = args.width if args.width else 72
-            to_text.convert(input_file, output_file, width)
-        
-        elif output_file.endswith('.epub'):
-            to_epub.convert(input_file, output_file)
-        
-        else:
-            print("Error: Output file must have .html, .txt, or .epub extension")
-            sys.exit(1)
-    
+        width = args.width if args.width else 72
+        batch.convert_file(input_file, output_file, width)
+
     except Exception as e:
         print(f"Error during conversion: {e}")
         import traceback
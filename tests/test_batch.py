@@ -0,0 +1,45 @@
+"""
+Unit tests for batch conversion.
+
+Tests convert_many() in-process and through the process pool.
+"""
+
+import pytest
+
+from writers import to_text, to_epub
+from writers.batch import convert_file, convert_many, _convert_job
+
+
+class TestBatch:
+    """Test batch conversion helpers."""
+
+    def test_convert_many_matches_single_conversions(self, tmp_path):
+        """Test pooled and in-process batches produce the same files."""
+        fixtures = ['tests/fixtures/simple.xml', 'tests/fixtures/poetry.xml']
+        serial = [(f, str(tmp_path / f'serial{i}.txt')) for i, f in enumerate(fixtures)]
+        pooled = [(f, str(tmp_path / f'pooled{i}.txt'), 72) for i, f in enumerate(fixtures)]
+
+        assert convert_many(serial, workers=1) == [out for _, out in serial]
+        assert convert_many(pooled, workers=2) == [out for _, out, _ in pooled]
+
+        for i, fixture in enumerate(fixtures):
+            expected = tmp_path / f'expected{i}.txt'
+            to_text.convert(fixture, str(expected))
+            assert (tmp_path / f'serial{i}.txt').read_text() == expected.read_text()
+            assert (tmp_path / f'pooled{i}.txt').read_text() == expected.read_text()
+
+    def test_convert_file_rejects_unknown_extension(self, tmp_path):
+        """Test unsupported output formats raise ValueError."""
+        with pytest.raises(ValueError):
+            convert_file('tests/fixtures/simple.xml', str(tmp_path / 'out.pdf'))
+
+    def test_pool_jobs_render_epub_in_process(self, monkeypatch):
+        """Test EPUB jobs in batch workers don't start a nested process pool."""
+        calls = []
+        monkeypatch.setattr(to_epub, 'convert',
+                            lambda tei_file, output_file, **kwargs: calls.append(kwargs))
+
+        _convert_job(('book.xml', 'book.epub'))
+        convert_file('book.xml', 'book.epub')
+
+        assert calls == [{'parallel': False}, {'parallel': True}]
@@ -0,0 +1,187 @@
+"""
+Unit tests for shared TEI utilities.
+
+Tests incremental parsing with iter_text_parts() against the layouts
+find_text_parts() recognises.
+"""
+
+import pytest
+from lxml import etree
+
+from writers.common import (parse_tei, get_title, get_metadata, find_text_parts,
+                            iter_text_parts, plain_text, STRING_VALUE)
+from writers.core.base_renderer import local_tag
+
+
+LAYOUT_FIXTURES = [
+    'tests/fixtures/simple.xml',
+    'tests/fixtures/poetry.xml',
+    'tests/fixtures/layout_grouped.xml',
+    'tests/fixtures/layout_no_header.xml',
+    'tests/fixtures/layout_no_text.xml',
+    'tests/fixtures/layout_bare_body.xml',
+]
+
+BACK_BEFORE_BODY = '''<TEI xmlns="http://www.tei-c.org/ns/1.0"><teiHeader/>
+<text><back><p>Back</p></back><body><p>Body</p></body></text></TEI>'''
+
+
+def summarize(parts):
+    """Describe (part, element) items before the stream clears them."""
+    return [(part, local_tag(elem.tag), STRING_VALUE(elem).strip())
+            for part, elem in parts if part != 'header']
+
+
+def expected_parts(tei_file):
+    """Describe the section children find_text_parts() gives for a file."""
+    doc = parse_tei(tei_file)
+    items = []
+    for part, section in zip(('front', 'body', 'back'), find_text_parts(doc)):
+        if section is not None:
+            items.extend((part, child) for child in section if isinstance(child.tag, str))
+    return summarize(items)
+
+
+METADATA_TEI = '''<TEI xmlns="http://www.tei-c.org/ns/1.0" xml:lang="fr">
+  <teiHeader>
+    <fileDesc>
+      <titleStmt>
+        <title>Les Misérables</title>
+        <author><persName><forename>Victor</forename> <surname>Hugo</surname></persName>
+        </author>
+      </titleStmt>
+      <publicationStmt><p>Test publication</p></publicationStmt>
+      <sourceDesc>
+        <bibl><author>Someone Else</author></bibl>
+        <p>Test source</p>
+      </sourceDesc>
+    </fileDesc>
+  </teiHeader>
+  <text><body><p>Texte.</p></body></text>
+</TEI>'''
+
+
+class TestGetMetadata:
+    """Test metadata extraction from the TEI header."""
+
+    def test_language_and_author(self):
+        """Test xml:lang is read and the title statement's author text is joined."""
+        metadata = get_metadata(etree.ElementTree(etree.fromstring(METADATA_TEI)))
+
+        assert metadata == {
+            'title': 'Les Misérables',
+            'author': 'Victor Hugo',
+            'lang': 'fr',
+            'publication': 'Test publication',
+            'source': 'Test source',
+        }
+
+    def test_missing_language_and_author(self):
+        """Test documents without xml:lang or <author> give None for both."""
+        metadata = get_metadata(parse_tei('tests/fixtures/simple.xml'))
+
+        assert metadata['lang'] is None
+        assert metadata['author'] is None
+
+
+class TestPlainText:
+    """Test markup-free text extraction."""
+
+    def test_leaf_element(self):
+        """Test an element without children gives its stripped text."""
+        elem = etree.fromstring('<head xmlns="http://www.tei-c.org/ns/1.0"> Title </head>')
+        assert plain_text(elem) == 'Title'
+
+    def test_empty_element(self):
+        """Test an empty element gives an empty string."""
+        elem = etree.fromstring('<head xmlns="http://www.tei-c.org/ns/1.0"/>')
+        assert plain_text(elem) == ''
+
+    def test_nested_markup(self):
+        """Test text inside child elements and tails is included in order."""
+        elem = etree.fromstring('<head xmlns="http://www.tei-c.org/ns/1.0"> The '
+                                '<emph>Long</emph> <hi>Day</hi> Ends </head>')
+        assert plain_text(elem) == 'The Long Day Ends'
+
+
+class TestIterTextParts:
+    """Test incremental parsing of TEI documents."""
+
+    @pytest.mark.parametrize('fixture', LAYOUT_FIXTURES)
+    def test_matches_find_text_parts(self, fixture):
+        """Test streamed children are the section children of the full tree."""
+        assert summarize(iter_text_parts(fixture)) == expected_parts(fixture)
+
+    @pytest.mark.parametrize('fixture', LAYOUT_FIXTURES)
+    def test_header_comes_first_and_once(self, fixture):
+        """Test the header tree is yielded once, before any section child."""
+        parts = [part for part, _ in iter_text_parts(fixture)]
+        assert parts[0] == 'header'
+        assert parts.count('header') == 1
+
+    def test_header_tree_has_title(self):
+        """Test the header tree is complete when yielded."""
+        _, tree = next(iter_text_parts('tests/fixtures/layout_grouped.xml'))
+        assert get_title(tree) == 'Grouped Texts'
+
+    def test_bare_body_children_are_streamed(self):
+        """Test heads, paragraphs and verse directly in <body> are yielded in order."""
+        parts = summarize(iter_text_parts('tests/fixtures/layout_bare_body.xml'))
+
+        assert [(part, tag) for part, tag, _ in parts] == [
+            ('front', 'p'),
+            ('body', 'head'), ('body', 'p'), ('body', 'lg'), ('body', 'div'), ('body', 'p'),
+            ('back', 'p'),
+        ]
+
+    def test_streamed_child_keeps_part_attributes(self):
+        """Test a streamed child's parent is its part element, attributes intact."""
+        for part, elem in iter_text_parts('tests/fixtures/layout_bare_body.xml'):
+            if part == 'body':
+                assert local_tag(elem.getparent().tag) == 'body'
+                assert elem.getparent().get('{http://www.w3.org/XML/1998/namespace}id') == 'main'
+
+    def test_earlier_siblings_are_released(self):
+        """Test each child is emptied and detached as the stream moves on."""
+        previous = None
+        for part, elem in iter_text_parts('tests/fixtures/layout_bare_body.xml'):
+            if part != 'body':
+                continue
+            # At most the previous child remains before this one, already emptied
+            siblings = [s for s in elem.itersiblings(preceding=True)
+                        if isinstance(s.tag, str)]
+            assert len(siblings) <= 1
+            for sibling in siblings:
+                assert len(sibling) == 0 and sibling.text is None
+            if previous is not None:
+                assert len(previous) == 0
+            previous = elem
+
+    def test_grouped_texts_use_fallback(self):
+        """Test grouped texts yield the first front, body and back in the document."""
+        parts = summarize(iter_text_parts('tests/fixtures/layout_grouped.xml'))
+
+        assert parts == [
+            ('front', 'p', 'Front matter of the collection.'),
+            ('body', 'div', 'First Text\n            Body of the first text.'),
+            ('back', 'p', 'Back matter of the first text.'),
+        ]
+
+    def test_back_before_body_uses_fallback(self, tmp_path):
+        """Test a back that precedes the body is still found, after the body."""
+        tei = tmp_path / 'back_first.xml'
+        tei.write_text(BACK_BEFORE_BODY)
+
+        parts = summarize(iter_text_parts(str(tei)))
+
+        assert parts == [('body', 'p', 'Body'), ('back', 'p', 'Back')]
+        assert parts == expected_parts(str(tei))
+
+    def test_document_without_header(self):
+        """Test a header item is still yielded when there is no teiHeader."""
+        items = iter_text_parts('tests/fixtures/layout_no_header.xml')
+        part, tree = next(items)
+
+        assert part == 'header'
+        assert get_title(tree) == 'Untitled'
+        assert [p for p, _, _ in summarize(items)] == ['body', 'body', 'back']
@@ -197,3 +197,13 @@ class TestRenderContext:
         assert new_ctx.indent_level == 1
         assert new_ctx.line_width == 80
         assert new_ctx.xhtml is True
+
+    def test_derived_contexts_are_shared(self):
+        """Test that repeated derivations return the same context."""
+        ctx = RenderContext()
+
+        assert ctx.with_parent('p') is ctx.with_parent('p')
+        assert ctx.with_parent('p') is not ctx.with_parent('p', 'center')
+        assert ctx.with_deeper_quote() is ctx.with_deeper_quote()
+        assert ctx.with_indent(2) is not ctx.with_indent(1)
+        assert ctx.with_parent('p') == RenderContext(parent_tag='p')
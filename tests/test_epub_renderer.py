@@ -4,9 +4,14 @@ Unit tests for EPUBRenderer.
 Tests EPUB3-compliant XHTML rendering with cross-file references.
 """
 
+import re
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+
 import pytest
 from lxml import etree
 
+from writers import to_epub
 from writers.core.context import RenderContext
 from writers.core.traverser import TEITraverser
 from writers.renderers.epub_renderer import EPUBRenderer
@@ -111,6 +116,20 @@ class TestEPUBRenderer:
 
         assert '<a href="#unknown">Unknown</a>' in result
 
+    def test_render_chapter_emdash_title(self):
+        """Test -- in the head becomes an em dash in <title> and <h2>, pre-extracted or not."""
+        xml = '''<div xmlns="http://www.tei-c.org/ns/1.0">
+            <head>One -- Two</head>
+            <p>Chapter content.</p>
+        </div>'''
+        elem = etree.fromstring(xml)
+
+        for result in (self.renderer.render_chapter(elem, 'Book Title'),
+                       self.renderer.render_chapter(elem, 'Book Title',
+                                                    chapter_title=to_epub.get_div_title(elem))):
+            assert '<title>One \u2014 Two</title>' in result
+            assert '<h2>One \u2014 Two</h2>' in result
+
     def test_render_chapter_basic(self):
         """Test rendering a basic chapter."""
         xml = '''<div xmlns="http://www.tei-c.org/ns/1.0">
@@ -235,6 +254,19 @@ class TestEPUBRenderer:
         assert '&lt;' in result or '<special>' not in result
         assert '&amp;' in result or '& ' not in result
 
+    def test_attribute_escaping(self):
+        """Test that link targets and image URLs are escaped in XHTML."""
+        xml = '''<div xmlns="http://www.tei-c.org/ns/1.0">
+            <p><ref target="http://example.com/?a=1&amp;b=2">link</ref></p>
+            <figure><graphic url="a&amp;b.png"/></figure>
+        </div>'''
+        elem = etree.fromstring(xml)
+
+        result = self.renderer.render_chapter(elem, 'Book Title')
+
+        assert 'href="http://example.com/?a=1&amp;b=2"' in result
+        assert 'src="a&amp;b.png"' in result
+
     def test_render_chapter_with_list(self):
         """Test chapter with list."""
         xml = '''<div xmlns="http://www.tei-c.org/ns/1.0">
@@ -294,6 +326,20 @@ class TestEPUBRenderer:
         assert '/>' in result  # Self-closing tag
         assert '<figcaption>Caption</figcaption>' in result
 
+    def test_render_chapter_with_image_map(self):
+        """Test that image URLs are mapped to their packaged paths."""
+        xml = '''<div xmlns="http://www.tei-c.org/ns/1.0">
+            <figure><graphic url="art/test.jpg"/></figure>
+            <figure><graphic url="missing.jpg"/></figure>
+        </div>'''
+        elem = etree.fromstring(xml)
+
+        result = self.renderer.render_chapter(elem, 'Book Title',
+                                              image_map={'art/test.jpg': 'images/test.jpg'})
+
+        assert '<img src="images/test.jpg"' in result
+        assert '<img src="missing.jpg"' in result
+
     def test_emphasis_in_paragraph(self):
         """Test emphasis rendering in XHTML."""
         xml = '''<p xmlns="http://www.tei-c.org/ns/1.0">Text with <hi rend="italic">emphasis</hi>.</p>'''
@@ -399,3 +445,112 @@ class TestMilestoneFormatSpecific:
         result = self.renderer.render_milestone(elem, self.context, self.traverser)
 
         assert result == '', "Any milestone with rend-epub='none' should be suppressed"
+
+
+# A book with several chapters, so rendering has more than one section
+CHAPTERS_TEI = '''<TEI xmlns="http://www.tei-c.org/ns/1.0">
+  <teiHeader><fileDesc><titleStmt><title>Chapters</title></titleStmt></fileDesc></teiHeader>
+  <text><body>
+''' + ''.join(f'''    <div type="chapter" xml:id="ch{n}">
+      <head>Chapter {n}</head>
+      <p>Text of chapter {n}, see <ref target="#ch1">the first</ref>.</p>
+    </div>
+''' for n in range(1, 6)) + '''  </body></text>
+</TEI>'''
+
+
+def read_epub(path):
+    """Return an EPUB's entries in archive order, ignoring the modification time."""
+    with zipfile.ZipFile(path) as epub:
+        entries = [(name, epub.read(name)) for name in epub.namelist()]
+    return [(name, re.sub(rb'(dcterms:modified">)[^<]*', rb'\1', data))
+            for name, data in entries]
+
+
+class BrokenAfterFirstPool:
+    """Stand-in process pool whose worker dies after the first result."""
+
+    def __init__(self, initializer, initargs):
+        initializer(*initargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def map(self, fn, jobs, chunksize=1):
+        yield fn(jobs[0])
+        raise BrokenProcessPool('worker killed')
+
+
+class TestEPUBConversion:
+    """Test to_epub.convert() section rendering."""
+
+    def convert(self, tmp_path, name):
+        """Convert CHAPTERS_TEI and return the archive entries."""
+        tei = tmp_path / 'book.xml'
+        tei.write_text(CHAPTERS_TEI)
+        output = tmp_path / name
+        to_epub.convert(str(tei), str(output))
+        return read_epub(output)
+
+    def test_process_pool_matches_in_process(self, tmp_path, monkeypatch):
+        """Test chapters rendered in worker processes match in-process rendering."""
+        expected = self.convert(tmp_path, 'serial.epub')
+
+        monkeypatch.setattr(to_epub, '_PARALLEL_MIN_SECTIONS', 1)
+        monkeypatch.setattr(to_epub.os, 'cpu_count', lambda: 2)
+        assert self.convert(tmp_path, 'pooled.epub') == expected
+
+    def test_broken_pool_falls_back_in_process(self, tmp_path, monkeypatch):
+        """Test a pool that breaks mid-book still produces the full book."""
+        expected = self.convert(tmp_path, 'serial.epub')
+
+        monkeypatch.setattr(to_epub, '_PARALLEL_MIN_SECTIONS', 1)
+        monkeypatch.setattr(to_epub.os, 'cpu_count', lambda: 2)
+        monkeypatch.setattr(to_epub, 'ProcessPoolExecutor', BrokenAfterFirstPool)
+        assert self.convert(tmp_path, 'fallback.epub') == expected
+
+    def test_package_doc_uses_document_language_and_author(self, tmp_path):
+        """Test content.opf carries the TEI xml:lang and author, not the defaults."""
+        tei = tmp_path / 'book.xml'
+        tei.write_text(CHAPTERS_TEI.replace(
+            '<TEI xmlns="http://www.tei-c.org/ns/1.0">',
+            '<TEI xmlns="http://www.tei-c.org/ns/1.0" xml:lang="fr">').replace(
+            '<title>Chapters</title>',
+            '<title>Chapters</title><author><persName>Victor <hi>Hugo</hi></persName></author>'))
+        output = tmp_path / 'book.epub'
+        to_epub.convert(str(tei), str(output))
+
+        opf = dict(read_epub(output))['OEBPS/content.opf'].decode('utf-8')
+        assert '<dc:language>fr</dc:language>' in opf
+        assert '<dc:creator>Victor Hugo</dc:creator>' in opf
+
+    def test_chapter_title_emdash_in_archive(self, tmp_path):
+        """Test chapter files written by convert() render -- in the head as an em dash."""
+        tei = tmp_path / 'book.xml'
+        tei.write_text(CHAPTERS_TEI.replace('<head>Chapter 1</head>', '<head>One -- Two</head>'))
+        output = tmp_path / 'book.epub'
+        to_epub.convert(str(tei), str(output))
+
+        chapter = dict(read_epub(output))['OEBPS/chapter1.xhtml'].decode('utf-8')
+        assert '<title>One \u2014 Two</title>' in chapter
+        assert '<h2 id="ch1">One \u2014 Two</h2>' in chapter
+
+    def test_failed_conversion_keeps_existing_output(self, tmp_path, monkeypatch):
+        """Test a conversion that fails part way leaves a previous EPUB untouched."""
+        tei = tmp_path / 'book.xml'
+        tei.write_text(CHAPTERS_TEI)
+        output = tmp_path / 'book.epub'
+        output.write_bytes(b'previous output')
+
+        def fail(*args):
+            raise RuntimeError('interrupted')
+        monkeypatch.setattr(to_epub, 'create_nav_doc', fail)
+
+        with pytest.raises(RuntimeError):
+            to_epub.convert(str(tei), str(output))
+
+        assert output.read_bytes() == b'previous output'
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['book.epub', 'book.xml']
@@ -10,7 +10,8 @@ from lxml import etree
 from writers.core.context import RenderContext
 from writers.core.traverser import TEITraverser
 from writers.renderers.html_renderer import HTMLRenderer
-from writers.common import parse_tei
+from writers import to_html
+from writers.common import parse_tei, iter_text_parts
 
 
 class TestHTMLRenderer:
@@ -362,3 +363,87 @@ class TestHTMLRenderer:
         result = self.renderer.render_quote(elem, context, self.traverser)
 
         assert '<div class="signature">Martin Luther King Jr.</div>' in result
+
+    def test_custom_css_cached_across_renders(self, tmp_path):
+        """Test custom CSS file is read once and reused for later documents."""
+        css_path = tmp_path / 'custom.css'
+        css_path.write_text('p { color: red; }', encoding='utf-8')
+        renderer = HTMLRenderer(css_file=str(css_path))
+        doc = parse_tei('tests/fixtures/simple.xml')
+
+        first = renderer.render_document_start(doc)
+        css_path.write_text('p { color: blue; }', encoding='utf-8')
+        second = renderer.render_document_start(doc)
+
+        assert '/* Custom styles */' in first
+        assert '    p { color: red; }' in first
+        assert second == first
+
+    def test_custom_css_content(self):
+        """Test in-memory custom CSS is embedded without a css_file."""
+        renderer = HTMLRenderer(css_content='p { color: red; }\nh2 { margin: 0; }')
+        doc = parse_tei('tests/fixtures/simple.xml')
+
+        result = renderer.render_document_start(doc)
+
+        assert '/* Custom styles */' in result
+        assert '    p { color: red; }\n    h2 { margin: 0; }' in result
+
+    def test_streamed_document_matches_traverse_document(self):
+        """Test incremental rendering produces the same HTML as the full tree."""
+        expected = TEITraverser(HTMLRenderer()).traverse_document(
+            parse_tei('tests/fixtures/nested_quotes.xml'))
+
+        pieces = TEITraverser(HTMLRenderer()).traverse_stream(
+            iter_text_parts('tests/fixtures/nested_quotes.xml'))
+
+        assert ''.join(pieces) == expected
+
+
+# Fixtures covering each layout iter_text_parts() handles
+LAYOUT_FIXTURES = [
+    'tests/fixtures/simple.xml',
+    'tests/fixtures/nested_quotes.xml',
+    'tests/fixtures/layout_grouped.xml',
+    'tests/fixtures/layout_no_header.xml',
+    'tests/fixtures/layout_no_text.xml',
+    'tests/fixtures/layout_bare_body.xml',
+]
+
+
+class TestHTMLConversion:
+    """Test to_html.convert() end to end."""
+
+    @pytest.mark.parametrize('fixture', LAYOUT_FIXTURES)
+    def test_convert_matches_traverse_document(self, fixture, tmp_path):
+        """Test streamed conversion writes the same HTML as the full tree."""
+        expected = TEITraverser(HTMLRenderer()).traverse_document(parse_tei(fixture))
+
+        output = tmp_path / 'out.html'
+        to_html.convert(fixture, str(output))
+
+        assert output.read_text(encoding='utf-8') == expected
+
+    def test_failed_conversion_keeps_existing_output(self, tmp_path):
+        """Test malformed input leaves a previous output file untouched."""
+        tei = tmp_path / 'broken.xml'
+        tei.write_text('<TEI xmlns="http://www.tei-c.org/ns/1.0"><text><body><p>x</body>')
+        output = tmp_path / 'prev.html'
+        output.write_text('previous output')
+
+        with pytest.raises(etree.XMLSyntaxError):
+            to_html.convert(str(tei), str(output))
+
+        assert output.read_text() == 'previous output'
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['broken.xml', 'prev.html']
+
+    def test_directory_target_raises_single_error(self, tmp_path):
+        """Test an output path that is a directory fails without a chained error."""
+        output = tmp_path / 'out.html'
+        output.mkdir()
+
+        with pytest.raises(OSError) as exc_info:
+            to_html.convert('tests/fixtures/simple.xml', str(output))
+
+        assert exc_info.value.__context__ is None
+        assert [p.name for p in tmp_path.iterdir()] == ['out.html']
@@ -4,13 +4,16 @@ Unit tests for TextRenderer.
 Tests plain text rendering with wrapping, indentation, and emphasis.
 """
 
+import textwrap
+
 import pytest
 from lxml import etree
 
 from writers.core.context import RenderContext
 from writers.core.traverser import TEITraverser
-from writers.renderers.text_renderer import TextRenderer
-from writers.common import parse_tei
+from writers.renderers.text_renderer import TextRenderer, _normalize_whitespace
+from writers import to_text
+from writers.common import parse_tei, iter_text_parts
 
 
 class TestTextRenderer:
@@ -253,6 +256,20 @@ class TestTextRenderer:
         assert len(result) == 2  # Caption + blank
         assert '[Illustration: Image Caption]' in result[0]
 
+    def test_figure_caption_wraps_after_prefix(self):
+        """Test a long first caption word moves to its own line after the prefix."""
+        renderer = TextRenderer(line_width=30)
+        xml = '''<figure xmlns="http://www.tei-c.org/ns/1.0">
+            <head>Supercalifragilisticexpialidocious-xx is long</head>
+        </figure>'''
+        elem = etree.fromstring(xml)
+        context = RenderContext(parent_tag='div')
+
+        result = renderer.render_figure(elem, context, TEITraverser(renderer))
+
+        assert result == ['[Illustration:', 'Supercalifragilisticexpialidocious-xx',
+                          'is long]', '']
+
     def test_milestone_stars(self):
         """Test milestone with stars rendering."""
         xml = '''<milestone xmlns="http://www.tei-c.org/ns/1.0" rend="stars"/>'''
@@ -336,6 +353,37 @@ class TestTextRenderer:
         # Should count: "Hello world test" = 16 chars
         assert visual_len == 16
 
+    def test_wrapper_cache(self):
+        """Test text wrappers are reused for the same width and indents."""
+        wrapper = self.renderer._get_wrapper(68, '    ', '    ')
+
+        assert self.renderer._get_wrapper(68, '    ', '    ') is wrapper
+        assert self.renderer._get_wrapper(72, '', '') is not wrapper
+        assert wrapper.wrap('word ' * 20) == textwrap.wrap(
+            'word ' * 20, width=68, initial_indent='    ', subsequent_indent='    ',
+            break_long_words=False, break_on_hyphens=False)
+
+    def test_wrap_normalized_matches_textwrap(self):
+        """Test greedy wrapping matches textwrap for normalized text."""
+        text = ' '.join(['alpha', 'be', 'gamma-delta', 'e'] * 12 + ['x' * 80, 'end'])
+
+        for width, indent in ((72, ''), (64, '        '), (20, '    ')):
+            expected = textwrap.wrap(text, width=width, initial_indent=indent,
+                                     subsequent_indent=indent,
+                                     break_long_words=False, break_on_hyphens=False)
+            assert self.renderer._wrap_normalized(text, width, indent) == expected
+
+    def test_normalize_whitespace(self):
+        """Test whitespace normalization matches split/join in all cases."""
+        samples = ['already normal', 'two  spaces', ' lead', 'trail ',
+                   'tab\there', 'line\nbreak', 'nb\xa0space', '', 'x']
+
+        for text in samples:
+            assert _normalize_whitespace(text) == ' '.join(text.split())
+
+        normal = 'already normal'
+        assert _normalize_whitespace(normal) is normal
+
     def test_complete_document(self):
         """Test rendering complete document from fixture."""
         doc = parse_tei('tests/fixtures/simple.xml')
@@ -428,3 +476,66 @@ class TestTextRenderer:
         # Total line: 8 (indent) + 50 (padding) + 6 (text) = 64 chars
         assert sig_line == '        ' + ' ' * 50 + 'Author'
         assert len(sig_line) == 64
+
+    def test_streamed_document_matches_traverse_document(self):
+        """Test incremental rendering produces the same lines as the full tree."""
+        expected = TEITraverser(TextRenderer()).traverse_document(
+            parse_tei('tests/fixtures/poetry.xml'))
+
+        lines = []
+        for piece in TEITraverser(TextRenderer()).traverse_stream(
+                iter_text_parts('tests/fixtures/poetry.xml')):
+            lines.extend(piece)
+
+        assert lines == expected
+
+
+# Fixtures covering each layout iter_text_parts() handles
+LAYOUT_FIXTURES = [
+    'tests/fixtures/simple.xml',
+    'tests/fixtures/poetry.xml',
+    'tests/fixtures/layout_grouped.xml',
+    'tests/fixtures/layout_no_header.xml',
+    'tests/fixtures/layout_no_text.xml',
+    'tests/fixtures/layout_bare_body.xml',
+]
+
+
+class TestTextConversion:
+    """Test to_text.convert() end to end."""
+
+    @pytest.mark.parametrize('fixture', LAYOUT_FIXTURES)
+    def test_convert_matches_traverse_document(self, fixture, tmp_path):
+        """Test streamed conversion writes the same text as the full tree."""
+        lines = TEITraverser(TextRenderer()).traverse_document(parse_tei(fixture))
+        expected = ''.join(line.replace('\xa0', ' ') + '\n' for line in lines)
+
+        output = tmp_path / 'out.txt'
+        to_text.convert(fixture, str(output))
+
+        assert output.read_text(encoding='utf-8') == expected
+
+    def test_failed_conversion_keeps_existing_output(self, tmp_path):
+        """Test malformed input leaves a previous output file untouched."""
+        tei = tmp_path / 'broken.xml'
+        tei.write_text('<TEI xmlns="http://www.tei-c.org/ns/1.0"><text><body><p>x</body>')
+        output = tmp_path / 'prev.txt'
+        output.write_text('previous output')
+
+        with pytest.raises(etree.XMLSyntaxError):
+            to_text.convert(str(tei), str(output))
+
+        assert output.read_text() == 'previous output'
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['broken.xml', 'prev.txt']
+
+    def test_directory_target_raises_single_error(self, tmp_path):
+        """Test an output path that is a directory fails without a chained error."""
+        output = tmp_path / 'out.txt'
+        output.mkdir()
+
+        with pytest.raises(OSError) as exc_info:
+            to_text.convert('tests/fixtures/simple.xml', str(output))
+
+        assert exc_info.value.__context__ is None
+        assert output.is_dir()
+        assert [p.name for p in tmp_path.iterdir()] == ['out.txt']
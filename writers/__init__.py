@@ -10,4 +10,5 @@ from . import common
 from . import to_html
 from . import to_text
 from . import to_epub
+from . import batch
 
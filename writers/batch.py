@@ -0,0 +1,73 @@
+"""
+batch.py - Convert several TEI files in one run
+
+Each conversion reads one TEI file and writes one output file with no
+shared state, so a batch is spread across a process pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from . import to_html, to_text, to_epub
+
+# Output file extensions convert_file() accepts
+OUTPUT_EXTENSIONS = ('.html', '.xhtml', '.txt', '.epub')
+
+
+def convert_file(tei_file, output_file, line_width=72, parallel=True):
+    """
+    Convert a TEI file to the format given by the output file's extension.
+
+    Args:
+        tei_file: Path to TEI XML input file
+        output_file: Path to .html/.xhtml, .txt or .epub output file
+        line_width: Width for line wrapping in text output (default 72)
+        parallel: Whether EPUB chapters may be rendered in a process pool
+
+    Raises:
+        ValueError: If the output file has an unsupported extension
+    """
+    if output_file.endswith(('.html', '.xhtml')):
+        to_html.convert(tei_file, output_file)
+    elif output_file.endswith('.txt'):
+        to_text.convert(tei_file, output_file, line_width)
+    elif output_file.endswith('.epub'):
+        to_epub.convert(tei_file, output_file, parallel=parallel)
+    else:
+        raise ValueError(f"Unsupported output format: {output_file} "
+                         "(must be .html, .txt, or .epub)")
+
+
+def convert_many(jobs, workers=None):
+    """
+    Run several conversions, in parallel where possible.
+
+    Args:
+        jobs: Iterable of (tei_file, output_file) or
+            (tei_file, output_file, line_width) tuples
+        workers: Maximum number of worker processes (default: CPU count);
+            1 converts in this process
+
+    Returns:
+        List of output file paths, in job order
+    """
+    jobs = [tuple(job) for job in jobs]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            convert_file(*job)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            # Consume the results so that worker exceptions are raised here
+            for _ in pool.map(_convert_job, jobs):
+                pass
+
+    return [job[1] for job in jobs]
+
+
+def _convert_job(job):
+    """Pool worker: run one convert_many() job."""
+    # Already one of several worker processes, so don't start another pool
+    convert_file(*job, parallel=False)
@@ -3,13 +3,45 @@ common.py - Shared utilities for TEI conversion
 """
 
 import os
-import glob
 import re
+import shutil
+import uuid
+from contextlib import contextmanager
 from lxml import etree
 
 # TEI namespace
 TEI_NS = {'tei': 'http://www.tei-c.org/ns/1.0'}
 
+# Clark-notation prefix for namespaced TEI tags ('{namespace}tag')
+TEI_TAG_PREFIX = f"{{{TEI_NS['tei']}}}"
+
+# Clark-notation name of the xml:id attribute
+XML_ID = '{http://www.w3.org/XML/1998/namespace}id'
+
+# Clark-notation name of the xml:lang attribute
+XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+
+# XPath string value of an element: all descendant text, joined in C
+STRING_VALUE = etree.XPath('string()', smart_strings=False)
+
+# Clark-notation tags compared directly against elem.tag in several modules
+TEI_DIV = TEI_TAG_PREFIX + 'div'
+TEI_HEAD = TEI_TAG_PREFIX + 'head'
+TEI_ITEM = TEI_TAG_PREFIX + 'item'
+TEI_ROW = TEI_TAG_PREFIX + 'row'
+TEI_CELL = TEI_TAG_PREFIX + 'cell'
+TEI_GRAPHIC = TEI_TAG_PREFIX + 'graphic'
+
+# Clark-notation tag whose first occurrence is the document title
+_TITLE = TEI_TAG_PREFIX + 'title'
+
+# Clark-notation tags of the parts of a TEI <text>
+_HEADER = TEI_TAG_PREFIX + 'teiHeader'
+_TEXT = TEI_TAG_PREFIX + 'text'
+_FRONT = TEI_TAG_PREFIX + 'front'
+_BODY = TEI_TAG_PREFIX + 'body'
+_BACK = TEI_TAG_PREFIX + 'back'
+
 def parse_tei(tei_file):
     """
     Parse a TEI XML file.
@@ -32,9 +64,24 @@ def get_title(doc):
     Returns:
         Title string or "Untitled"
     """
-    title_elem = doc.find('.//tei:title', TEI_NS)
+    title_elem = next(doc.iter(_TITLE), None)
     return title_elem.text if title_elem is not None else "Untitled"
 
+def plain_text(elem):
+    """
+    Extract all text content from an element, ignoring markup.
+
+    Args:
+        elem: The XML element
+
+    Returns:
+        Plain text content as a single string, stripped
+    """
+    if len(elem) == 0:
+        # No child nodes: the string value is just the element's text
+        return (elem.text or '').strip()
+    return STRING_VALUE(elem).strip()
+
 def get_metadata(doc):
     """
     Extract basic metadata from TEI header.
@@ -47,9 +94,18 @@ def get_metadata(doc):
     """
     metadata = {
         'title': get_title(doc),
+        'author': None,
+        'lang': doc.getroot().get(XML_LANG),
         'publication': None,
         'source': None
     }
+
+    # Prefer the title statement's author, else the first one in the header
+    author_elem = doc.find('tei:teiHeader/tei:fileDesc/tei:titleStmt/tei:author', TEI_NS)
+    if author_elem is None:
+        author_elem = doc.find('tei:teiHeader//tei:author', TEI_NS)
+    if author_elem is not None:
+        metadata['author'] = STRING_VALUE(author_elem).strip()
     
     pub_elem = doc.find('.//tei:publicationStmt/tei:p', TEI_NS)
     if pub_elem is not None:
@@ -61,6 +117,146 @@ def get_metadata(doc):
     
     return metadata
 
+def find_text_parts(doc):
+    """Return the (front, body, back) elements of the document, None where absent."""
+    text = next(doc.getroot().iterchildren(_TEXT), None)
+    if text is not None:
+        body = next(text.iterchildren(_BODY), None)
+        if body is not None:
+            # Usual layout: direct children of <TEI>/<text>, no descendant search
+            return (next(text.iterchildren(_FRONT), None), body,
+                    next(text.iterchildren(_BACK), None))
+
+    # Anything else (e.g. grouped texts): first match anywhere in the document,
+    # classified in a single walk rather than one scan per part
+    found = {}
+    for elem in doc.iter(_FRONT, _BODY, _BACK):
+        found.setdefault(elem.tag, elem)
+        if len(found) == 3:
+            break
+    return found.get(_FRONT), found.get(_BODY), found.get(_BACK)
+
+def iter_text_parts(tei_file):
+    """
+    Parse a TEI file incrementally, yielding the document piece by piece.
+
+    Yields ('header', tree) once, as soon as the teiHeader is complete
+    (tree is the partially parsed ElementTree), then ('front', child),
+    ('body', child) or ('back', child) for each element child of the parts
+    find_text_parts() would return, in document order.
+
+    With the usual <TEI>/<text> layout each child is yielded as soon as it
+    has been parsed, and is cleared (with its earlier siblings removed)
+    when the next item is requested, so only one child is held in memory
+    at a time. Any other layout is only known once parsing finishes; parts
+    that weren't streamed are then located with find_text_parts().
+
+    Renderers may therefore only look at a streamed child's subtree and its
+    ancestors: the part element and everything above it are complete apart
+    from their children, so their attributes can be read (as
+    HTMLRenderer.render_head does for the parent's xml:id), but earlier
+    siblings have already been emptied and later ones not yet parsed.
+
+    Args:
+        tei_file: Path to TEI XML file
+
+    Yields:
+        (part, element) tuples as described above
+    """
+    root = text = None
+    first_front = None
+    standard = False        # <text> has a direct <body>
+    streaming = {}          # part element -> part name, for parts being yielded
+    header_done = False
+
+    for event, elem in etree.iterparse(tei_file, events=('start', 'end')):
+        if root is None:
+            root = elem
+            continue
+        parent = elem.getparent()
+
+        if event == 'start':
+            tag = elem.tag
+            if tag == _FRONT and first_front is None:
+                first_front = elem
+            if parent is root:
+                if tag == _TEXT and text is None:
+                    text = elem
+            elif parent is text and text is not None:
+                # The same parts find_text_parts() picks: the first front
+                # (as long as no front came before it), then once <text> is
+                # known to have a body, the first body and back
+                if tag == _FRONT and elem is first_front:
+                    streaming[elem] = 'front'
+                elif tag == _BODY and not standard:
+                    standard = True
+                    streaming[elem] = 'body'
+                elif tag == _BACK and standard and 'back' not in streaming.values():
+                    streaming[elem] = 'back'
+            continue
+
+        if not header_done and elem.tag == _HEADER and parent is root:
+            header_done = True
+            yield 'header', root.getroottree()
+            continue
+
+        part = streaming.get(parent)
+        if part is not None and isinstance(elem.tag, str):
+            if not header_done:
+                header_done = True
+                yield 'header', root.getroottree()
+            yield part, elem
+            # Done with this child: drop its content and any earlier siblings
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del parent[0]
+
+    tree = root.getroottree()
+    if not header_done:
+        yield 'header', tree
+
+    # Parts that couldn't be streamed (any other layout) have been kept
+    # whole, so they can be looked up and yielded now
+    for part, section in zip(('front', 'body', 'back'), find_text_parts(tree)):
+        if section is None or section in streaming:
+            continue
+        for child in section:
+            if isinstance(child.tag, str):
+                yield part, child
+
+@contextmanager
+def atomic_output(output_file, binary=False):
+    """
+    Open an output file for writing so that it only appears once complete.
+
+    Writes go to a temporary file in the same directory, which replaces
+    output_file when the block finishes. If the block raises, only the
+    temporary file is removed, so an existing output_file is left as it was.
+
+    Args:
+        output_file: Path to the file to write
+        binary: Open the file in binary mode rather than as UTF-8 text
+
+    Yields:
+        File object opened for writing
+    """
+    directory, name = os.path.split(os.path.abspath(output_file))
+    temp_path = os.path.join(directory, f'.{name}.{uuid.uuid4().hex}.tmp')
+    if binary:
+        f = open(temp_path, 'xb')
+    else:
+        f = open(temp_path, 'x', encoding='utf-8')
+    try:
+        with f:
+            yield f
+        if os.path.isfile(output_file):
+            # Keep the permissions of the file being replaced
+            shutil.copymode(output_file, temp_path)
+        os.replace(temp_path, output_file)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
 def find_css_files(xml_file, format_type):
     """
     Find CSS files for the specified output format.
@@ -173,19 +369,35 @@ def find_css_files_unified(xml_file):
     xml_dir = os.path.dirname(os.path.abspath(xml_file))
 
     # Priority 1: Co-located CSS files
-    colocated_pattern = os.path.join(xml_dir, '*.css')
-    colocated_files = sorted(glob.glob(colocated_pattern))
+    colocated_files = _list_css_files(xml_dir)
     if colocated_files:
         return colocated_files
 
     # Priority 2: Shared css/ directory
-    shared_css_dir = os.path.join(xml_dir, 'css')
-    if os.path.isdir(shared_css_dir):
-        shared_pattern = os.path.join(shared_css_dir, '*.css')
-        shared_files = sorted(glob.glob(shared_pattern))
-        if shared_files:
-            return shared_files
+    shared_files = _list_css_files(os.path.join(xml_dir, 'css'))
+    if shared_files:
+        return shared_files
 
     # Priority 3: Not found
     return []
 
+def _list_css_files(directory):
+    """
+    List the *.css files in a directory, sorted by path.
+
+    Matches what glob('*.css') returns (case-sensitive, hidden files
+    excluded) from a single os.scandir() pass.
+
+    Args:
+        directory: Directory to search (need not exist)
+
+    Returns:
+        Sorted list of CSS file paths (empty if none or no such directory)
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(entry.path for entry in entries
+                          if entry.name.endswith('.css')
+                          and not entry.name.startswith('.'))
+    except (FileNotFoundError, NotADirectoryError):
+        return []
@@ -9,17 +9,51 @@ from abc import ABC, abstractmethod
 from typing import Any, List, Optional, Set, Tuple, TYPE_CHECKING
 from lxml import etree
 
+# TEI_NS is re-exported for code that imported it from here
+from ..common import TEI_NS, TEI_TAG_PREFIX, plain_text
+
 if TYPE_CHECKING:
     from .traverser import TEITraverser
     from .context import RenderContext
 
-# TEI namespace
-TEI_NS = {'tei': 'http://www.tei-c.org/ns/1.0'}
-
 # Special token for em-dash (converted from -- in markup)
 # Using a Unicode private use character that won't appear in normal text
 EMDASH_TOKEN = '\uE000'
 
+# Smart quote pairs indexed by quote depth parity: even depths (0, 2, 4...)
+# use double quotes, odd depths (1, 3, 5...) use single quotes
+SMART_QUOTES = (
+    ('\u201c', '\u201d'),  # " and "
+    ('\u2018', '\u2019'),  # ' and '
+)
+
+# Block-level tags rendered as children of a block quote
+QUOTE_BLOCK_TAGS = frozenset({'p', 'lg', 'list', 'table', 'figure', 'div', 'quote', 'signed'})
+
+# The same tags in namespaced form, mapped to their bare names. The keys
+# can be passed straight to iterchildren() to filter children in C.
+QUOTE_BLOCK_TAG_NAMES = {TEI_TAG_PREFIX + tag: tag for tag in sorted(QUOTE_BLOCK_TAGS)}
+
+# Tag names with the TEI namespace removed, keyed by Clark-notation tag.
+# TEI has a small, fixed vocabulary, so this stays tiny.
+_LOCAL_TAGS = {}
+
+
+def local_tag(tag: str) -> str:
+    """
+    Remove the TEI namespace from a tag name, caching the result.
+
+    Args:
+        tag: Tag name, possibly with namespace
+
+    Returns:
+        Tag name without namespace
+    """
+    name = _LOCAL_TAGS.get(tag)
+    if name is None:
+        name = _LOCAL_TAGS[tag] = tag.replace(TEI_TAG_PREFIX, '')
+    return name
+
 
 class BaseRenderer(ABC):
     """
@@ -86,12 +120,7 @@ class BaseRenderer(ABC):
         Returns:
             Tuple of (opening_quote, closing_quote) Unicode characters
         """
-        if depth % 2 == 0:
-            # Even depth (0, 2, 4...): use double quotes
-            return ('\u201c', '\u201d')  # " and "
-        else:
-            # Odd depth (1, 3, 5...): use single quotes
-            return ('\u2018', '\u2019')  # ' and '
+        return SMART_QUOTES[depth % 2]
 
     def preprocess_text(self, text: str) -> str:
         """
@@ -121,7 +150,7 @@ class BaseRenderer(ABC):
         Returns:
             Plain text content as a single string
         """
-        return ''.join(elem.itertext()).strip()
+        return plain_text(elem)
 
     def get_rend_class(self, elem: etree._Element, default: str = '') -> str:
         """
@@ -171,7 +200,7 @@ class BaseRenderer(ABC):
         Returns:
             Tag name without namespace
         """
-        return tag.replace(f"{{{TEI_NS['tei']}}}", '')
+        return local_tag(tag)
 
     def render_children(self, elem: etree._Element, context: 'RenderContext',
                        traverser: 'TEITraverser',
@@ -189,23 +218,27 @@ class BaseRenderer(ABC):
             skip_tags: Set of tag names to skip (optional)
 
         Returns:
-            List of rendered child elements
+            List of rendered child elements. Children rendered as lists
+            (e.g. lines of text) are flattened into the result.
         """
         results = []
-        skip_tags = skip_tags or set()
 
         for child in elem:
             # Skip non-element nodes (comments, etc.)
             if not isinstance(child.tag, str):
                 continue
 
-            child_tag = self.strip_namespace(child.tag)
+            # Only look up the tag name when something may be skipped
+            if skip_tags and local_tag(child.tag) in skip_tags:
+                continue
 
-            if child_tag not in skip_tags:
-                # Recursively render the child with current context
-                # (The child's renderer will update context as needed for its own children)
-                result = traverser.traverse_element(child, context)
-                if result:  # Only append non-empty results
+            # Recursively render the child with current context
+            # (The child's renderer will update context as needed for its own children)
+            result = traverser.traverse_element(child, context)
+            if result:  # Only append non-empty results
+                if isinstance(result, list):
+                    results.extend(result)
+                else:
                     results.append(result)
 
         return results
@@ -1,13 +1,13 @@
 """
 Context management for TEI rendering.
 
-The RenderContext dataclass provides an immutable container for all state
+The RenderContext dataclass provides a frozen container for all state
 that needs to be passed through recursive rendering calls. This eliminates
 parameter explosion and enables proper context inheritance.
 """
 
-from dataclasses import dataclass, replace
-from typing import Optional, Dict
+from dataclasses import dataclass, field, replace
+from typing import Any, Optional, Dict, Tuple
 
 
 @dataclass(frozen=True)
@@ -17,7 +17,15 @@ class RenderContext:
 
     This context object carries all state information needed during rendering,
     allowing child elements to inherit and modify context from their parents.
-    Being immutable (frozen=True) makes it thread-safe and easier to reason about.
+    Its fields can't be changed (frozen=True), which makes it easier to
+    reason about.
+
+    Because the fields are fixed, derived contexts are shared: with_parent(),
+    with_deeper_quote(), with_deeper_block() and with_indent() memoize their
+    results, so calling with_parent('p') twice on the same context returns
+    the same object. The memo is a plain per-instance dict that is filled in
+    as contexts are derived, without locking; a context tree should only be
+    used from one thread at a time.
 
     Attributes:
         parent_tag: Tag name of the parent element (e.g., 'p', 'div', 'quote')
@@ -29,6 +37,7 @@ class RenderContext:
         line_width: Maximum line width for text wrapping (default: 72)
         xhtml: Whether to generate XHTML-compliant output
         id_map: Mapping of IDs to file paths (for EPUB multi-file support)
+        image_map: Mapping of source image URLs to packaged paths (for EPUB)
     """
 
     # Parent element info
@@ -50,54 +59,85 @@ class RenderContext:
     # Cross-references (for EPUB)
     id_map: Optional[Dict[str, str]] = None
 
+    # Image locations (for EPUB)
+    image_map: Optional[Dict[str, str]] = None
+
+    # Contexts derived from this one, keyed by the change that produced them.
+    # An unsynchronized per-instance memo; the only mutable part of a context.
+    _derived: Dict[Tuple[Any, ...], 'RenderContext'] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+
+    def _derive(self, key: Tuple[Any, ...], **changes) -> 'RenderContext':
+        """
+        Return a (shared) copy of this context with the given field changes.
+
+        Args:
+            key: Cache key identifying the change
+            **changes: Field values for the derived context
+
+        Returns:
+            Cached or newly created RenderContext
+        """
+        derived = self._derived.get(key)
+        if derived is None:
+            derived = replace(self, **changes)
+            self._derived[key] = derived
+        return derived
+
     def with_parent(self, tag: str, rend: str = '') -> 'RenderContext':
         """
-        Return new context with updated parent information.
+        Return the context with updated parent information.
+
+        The result is memoized, so the same object is returned for the
+        same tag and rend.
 
         Args:
             tag: Parent element tag name
             rend: Parent element rend attribute value
 
         Returns:
-            New RenderContext with updated parent fields
+            Shared RenderContext with updated parent fields
         """
-        return replace(self, parent_tag=tag, parent_rend=rend)
+        return self._derive(('parent', tag, rend), parent_tag=tag, parent_rend=rend)
 
     def with_deeper_quote(self) -> 'RenderContext':
         """
-        Return new context with incremented quote depth.
+        Return the context with incremented quote depth.
 
         Use this when entering a nested quote to track nesting level
-        for alternating quote character selection.
+        for alternating quote character selection. The result is memoized.
 
         Returns:
-            New RenderContext with quote_depth incremented by 1
+            Shared RenderContext with quote_depth incremented by 1
         """
-        return replace(self, quote_depth=self.quote_depth + 1)
+        return self._derive(('quote',), quote_depth=self.quote_depth + 1)
 
     def with_deeper_block(self) -> 'RenderContext':
         """
-        Return new context with incremented block depth.
+        Return the context with incremented block depth.
 
         Use this when entering a nested block-level element like
-        a blockquote or div.
+        a blockquote or div. The result is memoized.
 
         Returns:
-            New RenderContext with block_depth incremented by 1
+            Shared RenderContext with block_depth incremented by 1
         """
-        return replace(self, block_depth=self.block_depth + 1)
+        return self._derive(('block',), block_depth=self.block_depth + 1)
 
     def with_indent(self, levels: int) -> 'RenderContext':
         """
-        Return new context with adjusted indentation level.
+        Return the context with adjusted indentation level.
+
+        The result is memoized, so the same object is returned for the
+        same number of levels.
 
         Args:
             levels: Number of indentation levels to add (can be negative to decrease)
 
         Returns:
-            New RenderContext with indent_level adjusted
+            Shared RenderContext with indent_level adjusted
         """
-        return replace(self, indent_level=self.indent_level + levels)
+        return self._derive(('indent', levels), indent_level=self.indent_level + levels)
 
     def with_xhtml(self, xhtml: bool) -> 'RenderContext':
         """
@@ -123,6 +163,18 @@ class RenderContext:
         """
         return replace(self, id_map=id_map)
 
+    def with_image_map(self, image_map: Dict[str, str]) -> 'RenderContext':
+        """
+        Return new context with updated image mapping.
+
+        Args:
+            image_map: Dictionary mapping source image URLs to packaged paths
+
+        Returns:
+            New RenderContext with updated image_map
+        """
+        return replace(self, image_map=image_map)
+
     @property
     def current_indent(self) -> str:
         """
@@ -6,11 +6,12 @@ decisions to a format-specific renderer. This separation allows the same
 traversal logic to be reused across all output formats.
 """
 
-from typing import Any
+from typing import Any, Iterable, Iterator, Tuple
 from lxml import etree
 
 from .context import RenderContext
-from .base_renderer import BaseRenderer, TEI_NS
+from .base_renderer import BaseRenderer, local_tag
+from ..common import find_text_parts
 
 
 class TEITraverser:
@@ -48,20 +49,19 @@ class TEITraverser:
         # Initial context for top-level elements
         root_context = RenderContext(parent_tag='TEI')
 
+        front, body, back = find_text_parts(doc)
+
         # Process front matter if present
-        front = doc.find('.//tei:front', TEI_NS)
         if front is not None:
             front_context = root_context.with_parent('front')
             parts.append(self.traverse_section(front, front_context))
 
         # Process main body
-        body = doc.find('.//tei:body', TEI_NS)
         if body is not None:
             body_context = root_context.with_parent('body')
             parts.append(self.traverse_section(body, body_context))
 
         # Process back matter if present
-        back = doc.find('.//tei:back', TEI_NS)
         if back is not None:
             back_context = root_context.with_parent('back')
             parts.append(self.traverse_section(back, back_context))
@@ -90,19 +90,54 @@ class TEITraverser:
             if not isinstance(child.tag, str):
                 continue
 
-            child_tag = child.tag.replace(f"{{{TEI_NS['tei']}}}", '')
-
-            # Update context for this child
-            child_rend = child.get('rend', '')
-            child_context = context.with_parent(child_tag, child_rend)
-
-            # Traverse the child element
-            result = self.traverse_element(child, child_context)
+            result = self.traverse_section_child(child, context)
             if result:
                 children.append(result)
 
         return self._combine_parts(children)
 
+    def traverse_section_child(self, child: etree._Element, context: RenderContext) -> Any:
+        """
+        Traverse one element child of a document section.
+
+        Args:
+            child: Element child of a front, body, or back element
+            context: Rendering context of the section
+
+        Returns:
+            Rendered child element
+        """
+        # Update context for this child
+        child_context = context.with_parent(local_tag(child.tag), child.get('rend', ''))
+
+        # Traverse the child element
+        return self.traverse_element(child, child_context)
+
+    def traverse_stream(self, parts: Iterable[Tuple[str, Any]]) -> Iterator[Any]:
+        """
+        Traverse a document as it is parsed, yielding rendered pieces.
+
+        Renders the (part, element) items from common.iter_text_parts() one
+        at a time, so each section child is rendered before the next one is
+        parsed. For renderers producing strings, joining the yielded pieces
+        gives the same output as traverse_document().
+
+        Args:
+            parts: Items from common.iter_text_parts()
+
+        Yields:
+            Document header, rendered section children, and document footer
+        """
+        root_context = RenderContext(parent_tag='TEI')
+
+        for part, elem in parts:
+            if part == 'header':
+                yield self.renderer.render_document_start(elem)
+            else:
+                yield self.traverse_section_child(elem, root_context.with_parent(part))
+
+        yield self.renderer.render_document_end()
+
     def traverse_element(self, elem: etree._Element, context: RenderContext) -> Any:
         """
         Recursively traverse a single element and its children.
@@ -118,7 +153,7 @@ class TEITraverser:
             Rendered element (type depends on renderer)
         """
         # Strip namespace from tag
-        tag = elem.tag.replace(f"{{{TEI_NS['tei']}}}", '')
+        tag = local_tag(elem.tag)
 
         # Delegate rendering to the renderer
         # The renderer may call back to this method for child elements
@@ -1,51 +1,54 @@
 import os
-import shutil
-from .common import TEI_NS
+import zipfile
+from .common import TEI_GRAPHIC
+
+# Cover image names, in order of preference; covers go at the top of OEBPS
+COVER_FILENAMES = ('cover.jpg', 'cover.jpeg', 'cover.png', 'cover.gif')
+
+# Image formats that are already compressed; deflating them again only costs CPU
+_STORED_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif'})
 
 def collect_graphic_urls(doc, input_dir):
-    """Return a set of all unique image URLs referenced by <graphic> elements, plus top-level cover images."""
-    urls = set()
-    
-    # Collect URLs from TEI graphic elements
-    for graphic in doc.findall('.//tei:graphic', TEI_NS):
-        url = graphic.get('url', '')
-        if url:
-            urls.add(url)
+    """Return the unique image URLs referenced by <graphic> elements, in document order, plus a top-level cover image."""
+    # dict.fromkeys drops duplicates but keeps first-appearance order, so the
+    # manifest and the archive list images the same way on every run
+    urls = dict.fromkeys(url for url in (graphic.get('url') for graphic in doc.iter(TEI_GRAPHIC))
+                         if url)
     
     # Check for top-level cover images
-    cover_files = ['cover.jpg', 'cover.jpeg', 'cover.png', 'cover.gif']
-    for cover_file in cover_files:
+    for cover_file in COVER_FILENAMES:
         cover_path = os.path.join(input_dir, cover_file)
         if os.path.exists(cover_path):
-            urls.add(cover_file)
+            urls[cover_file] = None
             break  # Only include the first cover file found
     
-    return urls
+    return list(urls)
 
-def copy_images_to_epub(urls, input_dir, images_dir):
-    """Copy image files from input_dir to images_dir, return a mapping of old->new paths."""
+def add_images_to_epub(urls, input_dir, epub, oebps_dir):
+    """Write image files from input_dir into the EPUB zip under oebps_dir, return a mapping of old->new paths."""
     mapping = {}
-    if not os.path.exists(images_dir):
-        os.makedirs(images_dir)
-    
-    # Get the parent directory of images_dir (OEBPS directory)
-    oebps_dir = os.path.dirname(images_dir)
-    
+    entries = {}
+
     for url in urls:
         src = os.path.join(input_dir, url)
         filename = os.path.basename(url)
         
         # Special handling for cover images - place them at the top level
-        if filename.lower() in ['cover.jpg', 'cover.jpeg', 'cover.png', 'cover.gif']:
-            dst = os.path.join(oebps_dir, filename)
+        if filename.lower() in COVER_FILENAMES:
             new_path = filename
         else:
-            dst = os.path.join(images_dir, filename)
             new_path = 'images/' + filename
             
         if os.path.exists(src):
-            shutil.copy2(src, dst)
+            # Same target name from different sources: the last one wins
+            entries[new_path] = src
             mapping[url] = new_path
         else:
             mapping[url] = url  # leave as-is if not found
+
+    # ZipFile.write streams each file in chunks rather than reading it whole
+    for new_path, src in entries.items():
+        ext = os.path.splitext(new_path)[1].lower()
+        compress_type = zipfile.ZIP_STORED if ext in _STORED_EXTENSIONS else None
+        epub.write(src, f'{oebps_dir}/{new_path}', compress_type=compress_type)
     return mapping
@@ -13,7 +13,18 @@ from lxml import etree
 from .html_renderer import HTMLRenderer
 from ..core.context import RenderContext
 from ..core.traverser import TEITraverser
-from ..core.base_renderer import TEI_NS
+from ..common import XML_ID, TEI_HEAD
+
+# Fixed XHTML document boilerplate around the rendered body
+_XHTML_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
+<head>
+  <title>{}</title>
+  <link rel="stylesheet" type="text/css" href="styles.css"/>
+</head>
+<body>'''.format
+_XHTML_FOOTER = '</body>\n</html>'
 
 
 class EPUBRenderer(HTMLRenderer):
@@ -36,7 +47,9 @@ class EPUBRenderer(HTMLRenderer):
         self.xhtml = True  # Force XHTML mode
 
     def render_chapter(self, div: etree._Element, book_title: str,
-                      id_map: Optional[Dict[str, str]] = None) -> str:
+                      id_map: Optional[Dict[str, str]] = None,
+                      image_map: Optional[Dict[str, str]] = None,
+                      chapter_title: Optional[str] = None) -> str:
         """
         Render a single chapter (div element) as complete XHTML document.
 
@@ -44,57 +57,55 @@ class EPUBRenderer(HTMLRenderer):
             div: The div element containing chapter content
             book_title: Book title for fallback
             id_map: Optional mapping of xml:id to filename for cross-references
+            image_map: Optional mapping of image URLs to their paths in the EPUB
+            chapter_title: Plain text of the div's head (as get_div_title()
+                returns it), if already extracted
 
         Returns:
             Complete XHTML document as string
         """
         # Get chapter title from head element
-        head = div.find('tei:head', TEI_NS)
-        chapter_title = self.extract_plain_text(head).strip() if head is not None else book_title
-
-        # Create context with id_map
+        head = next(div.iterchildren(TEI_HEAD), None)
+        if head is None:
+            chapter_title = book_title
+        elif chapter_title is None:
+            chapter_title = self.extract_plain_text(head)
+        else:
+            # Same result as extract_plain_text(head): -- becomes an em dash
+            chapter_title = self.process_text_for_html(chapter_title)
+
+        # Create context with id_map and image_map
         context = RenderContext(
             parent_tag='body',
             xhtml=True,
-            id_map=id_map or {}
+            id_map=id_map or {},
+            image_map=image_map
         )
 
         # Create traverser
         from ..core.traverser import TEITraverser
         traverser = TEITraverser(self)
 
-        # Start XHTML document
-        parts = []
-        parts.append('<?xml version="1.0" encoding="UTF-8"?>')
-        parts.append('<!DOCTYPE html>')
-        parts.append('<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">')
-        parts.append('<head>')
-        parts.append(f'  <title>{html.escape(chapter_title)}</title>')
-        parts.append('  <link rel="stylesheet" type="text/css" href="styles.css"/>')
-        parts.append('</head>')
-        parts.append('<body>')
+        # Start XHTML document (the title is escaped once for both uses)
+        escaped_title = html.escape(chapter_title)
+        parts = [_XHTML_HEADER(escaped_title)]
 
         # Add chapter heading if present
         if head is not None:
-            div_id = div.get('{http://www.w3.org/XML/1998/namespace}id', '')
+            # Heading text is the chapter title extracted above
+            div_id = div.get(XML_ID, '')
             if div_id:
-                heading_text = self.extract_plain_text(head).strip()
-                parts.append(f'<h2 id="{html.escape(div_id)}">{html.escape(heading_text)}</h2>')
+                parts.append(f'<h2 id="{html.escape(div_id)}">{escaped_title}</h2>')
             else:
-                heading_text = self.extract_plain_text(head).strip()
-                parts.append(f'<h2>{html.escape(heading_text)}</h2>')
+                parts.append(f'<h2>{escaped_title}</h2>')
 
         # Render all child elements (skipping the head we already processed)
+        child_context = context.with_parent('div')
         for elem in div:
-            if not isinstance(elem.tag, str):
+            if not isinstance(elem.tag, str) or elem.tag == TEI_HEAD:
                 continue
 
-            tag = self.strip_namespace(elem.tag)
-            if tag == 'head':
-                continue  # Already rendered
-
             # Render element with context
-            child_context = context.with_parent('div')
             result = traverser.traverse_element(elem, child_context)
 
             if result:
@@ -104,13 +115,13 @@ class EPUBRenderer(HTMLRenderer):
                     parts.append(result)
 
         # Close XHTML document
-        parts.append('</body>')
-        parts.append('</html>')
+        parts.append(_XHTML_FOOTER)
 
         return '\n'.join(parts)
 
     def render_section(self, section: etree._Element, book_title: str,
-                      id_map: Optional[Dict[str, str]] = None) -> str:
+                      id_map: Optional[Dict[str, str]] = None,
+                      image_map: Optional[Dict[str, str]] = None) -> str:
         """
         Render an entire section (body/front/back) as a complete XHTML document.
         Used when the section has no div children.
@@ -119,15 +130,17 @@ class EPUBRenderer(HTMLRenderer):
             section: The section element (body/front/back) to render
             book_title: Book title for the page title
             id_map: Optional mapping of xml:id to filename for cross-references
+            image_map: Optional mapping of image URLs to their paths in the EPUB
 
         Returns:
             Complete XHTML document as string
         """
-        # Create context with id_map
+        # Create context with id_map and image_map
         context = RenderContext(
             parent_tag='body',
             xhtml=True,
-            id_map=id_map or {}
+            id_map=id_map or {},
+            image_map=image_map
         )
 
         # Create traverser
@@ -135,24 +148,15 @@ class EPUBRenderer(HTMLRenderer):
         traverser = TEITraverser(self)
 
         # Start XHTML document
-        parts = []
-        parts.append('<?xml version="1.0" encoding="UTF-8"?>')
-        parts.append('<!DOCTYPE html>')
-        parts.append('<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">')
-        parts.append('<head>')
-        parts.append(f'  <title>{html.escape(book_title)}</title>')
-        parts.append('  <link rel="stylesheet" type="text/css" href="styles.css"/>')
-        parts.append('</head>')
-        parts.append('<body>')
+        parts = [_XHTML_HEADER(html.escape(book_title))]
 
         # Render all child elements
-        section_tag = self.strip_namespace(section.tag)
+        child_context = context.with_parent(self.strip_namespace(section.tag))
         for elem in section:
             if not isinstance(elem.tag, str):
                 continue
 
             # Render element with context
-            child_context = context.with_parent(section_tag)
             result = traverser.traverse_element(elem, child_context)
 
             if result:
@@ -162,8 +166,7 @@ class EPUBRenderer(HTMLRenderer):
                     parts.append(result)
 
         # Close XHTML document
-        parts.append('</body>')
-        parts.append('</html>')
+        parts.append(_XHTML_FOOTER)
 
         return '\n'.join(parts)
 
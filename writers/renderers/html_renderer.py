@@ -6,16 +6,94 @@ with context management. It properly handles nested elements with context inheri
 """
 
 import os
-import glob
 import html as html_module
 from datetime import datetime
-from typing import Any
+from typing import Any, List, Optional
 from lxml import etree  # type: ignore
 
-from ..core.base_renderer import BaseRenderer, TEI_NS, EMDASH_TOKEN
+from ..core.base_renderer import (BaseRenderer, EMDASH_TOKEN, QUOTE_BLOCK_TAG_NAMES,
+                                  local_tag)
 from ..core.context import RenderContext
 from ..core.traverser import TEITraverser
-from ..common import get_title
+from ..common import (get_title, TEI_TAG_PREFIX, XML_ID, TEI_HEAD, TEI_ITEM, TEI_ROW,
+                      TEI_CELL, TEI_GRAPHIC)
+
+# Namespaced tags used for direct child iteration
+_FIGDESC = TEI_TAG_PREFIX + 'figDesc'
+
+# Markup templates (bound format methods, reused for every element)
+_TH_CELL = '    <th>{}</th>'.format
+_TD_CELL = '    <td>{}</td>'.format
+_DIV_ID_CLASS = '<div id="{}" class="{}">'.format
+_DIV_ID = '<div id="{}">'.format
+_DIV_CLASS = '<div class="{}">'.format
+_IMG_XHTML = '  <img src="{}" alt="{}"/>'.format
+_IMG_HTML = '  <img src="{}" alt="{}">'.format
+_LINK = '<a href="{}">{}</a>'.format
+
+# Wrappers for inline elements rendered from their plain text
+_INLINE_TEMPLATES = {
+    'emph': '<em>{}</em>'.format,
+    'note': '<sup>[{}]</sup>'.format,
+    'foreign': '<i>{}</i>'.format,
+    'title': '<i>{}</i>'.format,
+}
+_HI_TEMPLATES = {
+    'italic': '<i>{}</i>'.format,
+    'bold': '<b>{}</b>'.format,
+}
+
+# Opening tags for verse lines by rend value, inside a stanza and directly
+# in an <lg>; any other rend value builds its tag when it is seen
+_LINE_CLASSES = {
+    '': 'line',
+    'indent': 'line indent',
+    'indent2': 'line indent2',
+    'indent3': 'line indent3',
+    'center': 'line center',
+}
+_STANZA_LINE_OPEN = {rend: f'    <div class="{cls}">' for rend, cls in _LINE_CLASSES.items()}
+_VERSE_LINE_OPEN = {rend: f'  <div class="{cls}">' for rend, cls in _LINE_CLASSES.items()}
+
+# Default stylesheet, embedded in every HTML document
+_DEFAULT_CSS = (
+    '    body { margin-left: 10%; margin-right: 10%; line-height: 1.25; }',
+    '    h1 { text-align: center; }',
+    '    h2 { margin-top: 2em; }',
+    '    .italic { font-style: italic; }',
+    '    .bold { font-weight: bold; }',
+    '    .underline { text-decoration: underline; }',
+    '    .small-caps { font-variant: small-caps; }',
+    '    .signature { text-align: right; font-style: italic; margin-top: 0.5em; }',
+    '    blockquote { margin: 1em 2em; }',
+    '    figure { margin: 2em auto; width: 80%; max-width: 100%; text-align: center; }',
+    '    figure.left { float: left; margin: 0 2em 1em 0; width: 50%; max-width: 50%; }',
+    '    figure.right { float: right; margin: 0 0 1em 2em; width: 50%; max-width: 50%; }',
+    '    figure.center { margin: 2em auto; display: block; }',
+    '    figure img { width: 100%; height: auto; }',
+    '    figcaption { margin-top: 0.5em; font-style: italic; }',
+    '    .poem { margin: 1em 0; }',
+    '    .poem.center { text-align: center; }',
+    '    .poem.center .stanza { display: inline-block; text-align: left; }',
+    '    .poem-title { text-align: center; font-weight: bold; margin-bottom: 1em; }',
+    '    .stanza { margin-bottom: 1em; }',
+    '    .line { margin-top: 0; margin-bottom: 0; }',
+    '    .indent { margin-left: 2em; }',
+    '    .indent2 { margin-left: 4em; }',
+    '    .indent3 { margin-left: 6em; }',
+    '    .center { text-align: center; }',
+    '    .milestone { text-align: center; margin: 0; }',
+    '    .milestone.stars { margin: 1.25em 0; }',
+    '    .milestone.stars::before { content: "*       *       *       *       *"; white-space: pre; }',
+    '    .milestone.space { height: 1.25em; }',
+    '    .milestone[class*="space"] { height: 1.25em; }',
+    '    .milestone.space2 { height: 2.5em; }',
+    '    .milestone.space3 { height: 3.75em; }',
+    '    .milestone.space4 { height: 5em; }',
+    '    .milestone.space5 { height: 6.25em; }',
+    '    table { border-collapse: collapse; margin: 1em 0; }',
+    '    td, th { border: 1px solid #ccc; padding: 0.5em; }',
+)
 
 
 class HTMLRenderer(BaseRenderer):
@@ -26,15 +104,33 @@ class HTMLRenderer(BaseRenderer):
     Supports all 33 elements defined in element-set.md.
     """
 
-    def __init__(self, css_file: str = None):
+    def __init__(self, css_file: str = None, css_content: Optional[str] = None):
         """
         Initialize HTML renderer.
 
         Args:
             css_file: Optional path to external CSS file
+            css_content: Optional custom CSS text; takes precedence over css_file
         """
         self.css_file = css_file
+        self.css_content = css_content
         self.title = ''
+        # Indented custom CSS lines, cached per CSS source across renders
+        self._custom_css_cache = None
+
+        # Block element handlers, keyed by tag name without namespace
+        self._handlers = {
+            'div': self.render_div,
+            'head': self.render_head,
+            'p': self.render_paragraph,
+            'quote': self.render_quote,
+            'lg': self.render_line_group,
+            'list': self.render_list,
+            'table': self.render_table,
+            'figure': self.render_figure,
+            'milestone': self.render_milestone,
+            'signed': self.render_signed,
+        }
 
     def extract_plain_text(self, elem: etree._Element) -> str:
         """
@@ -93,13 +189,11 @@ class HTMLRenderer(BaseRenderer):
         parts.extend(self._get_default_css())
 
         # Append custom CSS if provided
-        if self.css_file and os.path.exists(self.css_file):
-            with open(self.css_file, 'r', encoding='utf-8') as f:
-                css_content = f.read()
+        custom_css = self._get_custom_css()
+        if custom_css is not None:
             parts.append('')
             parts.append('    /* Custom styles */')
-            for line in css_content.splitlines():
-                parts.append('    ' + line)
+            parts.extend(custom_css)
 
         parts.append('  </style>')
         parts.append('</head>')
@@ -117,46 +211,38 @@ class HTMLRenderer(BaseRenderer):
         """
         return '\n</body>\n</html>'
 
+    def _get_custom_css(self) -> Optional[List[str]]:
+        """
+        Get the custom CSS as indented lines, reading any file only once.
+
+        In-memory css_content is used when given; otherwise css_file is read.
+        The result is cached against its source so that rendering several
+        documents with the same renderer doesn't re-read the file.
+
+        Returns:
+            List of indented CSS lines, or None if there is no custom CSS
+        """
+        css_content = self.css_content
+        if css_content is not None:
+            source = ('content', css_content)
+        elif self.css_file and os.path.exists(self.css_file):
+            source = ('file', self.css_file)
+        else:
+            return None
+
+        cache = self._custom_css_cache
+        if cache is None or cache[0] != source:
+            if css_content is None:
+                with open(self.css_file, 'r', encoding='utf-8') as f:
+                    css_content = f.read()
+            lines = ['    ' + line for line in css_content.splitlines()]
+            cache = self._custom_css_cache = (source, lines)
+
+        return cache[1]
+
     def _get_default_css(self) -> list:
         """Get default CSS rules as list of strings."""
-        return [
-            '    body { margin-left: 10%; margin-right: 10%; line-height: 1.25; }',
-            '    h1 { text-align: center; }',
-            '    h2 { margin-top: 2em; }',
-            '    .italic { font-style: italic; }',
-            '    .bold { font-weight: bold; }',
-            '    .underline { text-decoration: underline; }',
-            '    .small-caps { font-variant: small-caps; }',
-            '    .signature { text-align: right; font-style: italic; margin-top: 0.5em; }',
-            '    blockquote { margin: 1em 2em; }',
-            '    figure { margin: 2em auto; width: 80%; max-width: 100%; text-align: center; }',
-            '    figure.left { float: left; margin: 0 2em 1em 0; width: 50%; max-width: 50%; }',
-            '    figure.right { float: right; margin: 0 0 1em 2em; width: 50%; max-width: 50%; }',
-            '    figure.center { margin: 2em auto; display: block; }',
-            '    figure img { width: 100%; height: auto; }',
-            '    figcaption { margin-top: 0.5em; font-style: italic; }',
-            '    .poem { margin: 1em 0; }',
-            '    .poem.center { text-align: center; }',
-            '    .poem.center .stanza { display: inline-block; text-align: left; }',
-            '    .poem-title { text-align: center; font-weight: bold; margin-bottom: 1em; }',
-            '    .stanza { margin-bottom: 1em; }',
-            '    .line { margin-top: 0; margin-bottom: 0; }',
-            '    .indent { margin-left: 2em; }',
-            '    .indent2 { margin-left: 4em; }',
-            '    .indent3 { margin-left: 6em; }',
-            '    .center { text-align: center; }',
-            '    .milestone { text-align: center; margin: 0; }',
-            '    .milestone.stars { margin: 1.25em 0; }',
-            '    .milestone.stars::before { content: "*       *       *       *       *"; white-space: pre; }',
-            '    .milestone.space { height: 1.25em; }',
-            '    .milestone[class*="space"] { height: 1.25em; }',
-            '    .milestone.space2 { height: 2.5em; }',
-            '    .milestone.space3 { height: 3.75em; }',
-            '    .milestone.space4 { height: 5em; }',
-            '    .milestone.space5 { height: 6.25em; }',
-            '    table { border-collapse: collapse; margin: 1em 0; }',
-            '    td, th { border: 1px solid #ccc; padding: 0.5em; }',
-        ]
+        return list(_DEFAULT_CSS)
 
     def render_element(self, elem: etree._Element, tag: str,
                       context: RenderContext, traverser: TEITraverser) -> str:
@@ -175,45 +261,27 @@ class HTMLRenderer(BaseRenderer):
             Rendered HTML string
         """
         # Dispatch to specific handler
-        if tag == 'div':
-            return self.render_div(elem, context, traverser)
-        elif tag == 'head':
-            return self.render_head(elem, context, traverser)
-        elif tag == 'p':
-            return self.render_paragraph(elem, context, traverser)
-        elif tag == 'quote':
-            return self.render_quote(elem, context, traverser)
-        elif tag == 'lg':
-            return self.render_line_group(elem, context, traverser)
-        elif tag == 'list':
-            return self.render_list(elem, context, traverser)
-        elif tag == 'table':
-            return self.render_table(elem, context, traverser)
-        elif tag == 'figure':
-            return self.render_figure(elem, context, traverser)
-        elif tag == 'milestone':
-            return self.render_milestone(elem, context, traverser)
-        elif tag == 'signed':
-            return self.render_signed(elem, context, traverser)
-        else:
+        handler = self._handlers.get(tag)
+        if handler is None:
             # Unknown block element - just render text
             return self.render_text_content(elem, context)
+        return handler(elem, context, traverser)
 
     def render_div(self, elem: etree._Element, context: RenderContext,
                    traverser: TEITraverser) -> str:
         """Render a div element."""
         div_type = elem.get('type', '')
-        div_id = elem.get('{http://www.w3.org/XML/1998/namespace}id', '')
+        div_id = elem.get(XML_ID, '')
 
         parts = []
 
         # Build opening div tag
         if div_id and div_type:
-            parts.append(f'<div id="{div_id}" class="{div_type}">')
+            parts.append(_DIV_ID_CLASS(div_id, div_type))
         elif div_id:
-            parts.append(f'<div id="{div_id}">')
+            parts.append(_DIV_ID(div_id))
         elif div_type:
-            parts.append(f'<div class="{div_type}">')
+            parts.append(_DIV_CLASS(div_type))
         else:
             parts.append('<div>')
 
@@ -231,7 +299,7 @@ class HTMLRenderer(BaseRenderer):
         # Determine heading level based on context
         if context.parent_tag in ('div', 'front', 'back', 'body'):
             # Chapter/section heading
-            div_id = elem.getparent().get('{http://www.w3.org/XML/1998/namespace}id', '')
+            div_id = elem.getparent().get(XML_ID, '')
             if div_id:
                 return f'<h2 id="{div_id}">{self.render_text_content(elem, context)}</h2>'
             else:
@@ -268,17 +336,14 @@ class HTMLRenderer(BaseRenderer):
             return f'{open_quote}{content}{close_quote}'
         else:
             # Block quote - recursively render children
-            block_children = [child for child in elem
-                            if isinstance(child.tag, str) and
-                            self.strip_namespace(child.tag) in
-                            ['p', 'lg', 'list', 'table', 'figure', 'div', 'quote', 'signed']]
+            block_children = list(elem.iterchildren(*QUOTE_BLOCK_TAG_NAMES))
 
             if block_children:
                 # Render children with blockquote context
                 child_context = context.with_deeper_block()
                 children = []
                 for child in block_children:
-                    child_tag = self.strip_namespace(child.tag)
+                    child_tag = QUOTE_BLOCK_TAG_NAMES[child.tag]
                     child_rend = child.get('rend', '')
                     grandchild_context = child_context.with_parent(child_tag, child_rend)
                     result = traverser.traverse_element(child, grandchild_context)
@@ -310,7 +375,7 @@ class HTMLRenderer(BaseRenderer):
             if not isinstance(child.tag, str):
                 continue
 
-            child_tag = self.strip_namespace(child.tag)
+            child_tag = local_tag(child.tag)
 
             if child_tag == 'head':
                 # Poem title
@@ -318,43 +383,43 @@ class HTMLRenderer(BaseRenderer):
                 parts.append(f'  <div class="poem-title">{content}</div>')
 
             elif child_tag == 'lg':
-                # Nested stanza
-                parts.append('  <div class="stanza">')
+                # Nested stanza - collected separately and joined once
+                stanza_parts = ['  <div class="stanza">']
                 stanza_context = child_context.with_parent('lg')
 
                 for stanza_child in child:
                     if not isinstance(stanza_child.tag, str):
                         continue
-                    stanza_child_tag = self.strip_namespace(stanza_child.tag)
+                    stanza_child_tag = local_tag(stanza_child.tag)
 
                     if stanza_child_tag == 'l':
                         # Line of verse
                         line_rend = stanza_child.get('rend', '')
-                        line_class = f'line {line_rend}' if line_rend else 'line'
+                        line_open = (_STANZA_LINE_OPEN.get(line_rend)
+                                     or f'    <div class="line {line_rend}">')
                         line_content = self.render_text_content(stanza_child, stanza_context)
-                        parts.append(f'    <div class="{line_class}">{line_content}</div>')
+                        stanza_parts.append(line_open + line_content + '</div>')
                     else:
                         # Other elements in stanza (recursive)
                         result = traverser.traverse_element(stanza_child, stanza_context)
                         if result:
-                            for line in result.split('\n'):
-                                parts.append('    ' + line)
+                            stanza_parts.extend('    ' + line for line in result.split('\n'))
 
-                parts.append('  </div>')
+                stanza_parts.append('  </div>')
+                parts.append('\n'.join(stanza_parts))
 
             elif child_tag == 'l':
                 # Line of verse (not in stanza)
                 line_rend = child.get('rend', '')
-                line_class = f'line {line_rend}' if line_rend else 'line'
+                line_open = _VERSE_LINE_OPEN.get(line_rend) or f'  <div class="line {line_rend}">'
                 line_content = self.render_text_content(child, child_context)
-                parts.append(f'  <div class="{line_class}">{line_content}</div>')
+                parts.append(line_open + line_content + '</div>')
 
             else:
                 # Other block elements in poem
                 result = traverser.traverse_element(child, child_context)
                 if result:
-                    for line in result.split('\n'):
-                        parts.append('  ' + line)
+                    parts.extend('  ' + line for line in result.split('\n'))
 
         parts.append('</div>')
         return '\n'.join(parts)
@@ -362,32 +427,26 @@ class HTMLRenderer(BaseRenderer):
     def render_list(self, elem: etree._Element, context: RenderContext,
                    traverser: TEITraverser) -> str:
         """Render a list element."""
-        items = []
-        child_context = context.with_parent('list')
+        item_context = context.with_parent('list').with_parent('item')
 
-        for item in elem.findall('tei:item', TEI_NS):
-            item_context = child_context.with_parent('item')
-            content = self.render_text_content(item, item_context)
-            items.append(f'  <li>{content}</li>')
+        items = [f'  <li>{self.render_text_content(item, item_context)}</li>'
+                 for item in elem.iterchildren(TEI_ITEM)]
 
         return '<ul>\n' + '\n'.join(items) + '\n</ul>'
 
     def render_table(self, elem: etree._Element, context: RenderContext,
                     traverser: TEITraverser) -> str:
         """Render a table element."""
-        rows = []
-        child_context = context.with_parent('table')
-
-        for row in elem.findall('tei:row', TEI_NS):
-            cells = []
-            row_context = child_context.with_parent('row')
-
-            for cell in row.findall('tei:cell', TEI_NS):
-                cell_tag = 'th' if cell.get('role') == 'label' else 'td'
-                cell_context = row_context.with_parent('cell')
-                content = self.render_text_content(cell, cell_context)
-                cells.append(f'    <{cell_tag}>{content}</{cell_tag}>')
+        # Cell context is the same for every cell, so build it once
+        cell_context = context.with_parent('table').with_parent('row').with_parent('cell')
 
+        rows = []
+        for row in elem.iterchildren(TEI_ROW):
+            cells = [
+                (_TH_CELL if cell.get('role') == 'label' else _TD_CELL)(
+                    self.render_text_content(cell, cell_context))
+                for cell in row.iterchildren(TEI_CELL)
+            ]
             rows.append('  <tr>\n' + '\n'.join(cells) + '\n  </tr>')
 
         return '<table>\n' + '\n'.join(rows) + '\n</table>'
@@ -395,7 +454,7 @@ class HTMLRenderer(BaseRenderer):
     def render_figure(self, elem: etree._Element, context: RenderContext,
                      traverser: TEITraverser) -> str:
         """Render a figure with image and caption."""
-        graphic = elem.find('tei:graphic', TEI_NS)
+        graphic = next(elem.iterchildren(TEI_GRAPHIC), None)
         width = graphic.get('width', '') if graphic is not None else ''
         rend = self.get_rend_class(elem)
 
@@ -414,20 +473,22 @@ class HTMLRenderer(BaseRenderer):
         # Render image
         if graphic is not None:
             url = graphic.get('url', '')
+            if context.image_map:
+                url = context.image_map.get(url, url)
 
             # Get alt text from figDesc
-            figdesc = elem.find('tei:figDesc', TEI_NS)
+            figdesc = next(elem.iterchildren(_FIGDESC), None)
             alt_text = self.extract_plain_text(figdesc) if figdesc is not None else ''
             if context.xhtml:
                 alt_text = html_module.escape(alt_text)
 
             if context.xhtml:
-                parts.append(f'  <img src="{url}" alt="{alt_text}"/>')
+                parts.append(_IMG_XHTML(html_module.escape(url), alt_text))
             else:
-                parts.append(f'  <img src="{url}" alt="{alt_text}">')
+                parts.append(_IMG_HTML(url, alt_text))
 
         # Add caption from head
-        head = elem.find('tei:head', TEI_NS)
+        head = next(elem.iterchildren(TEI_HEAD), None)
         if head is not None:
             child_context = context.with_parent('figure')
             caption = self.render_text_content(head, child_context)
@@ -462,108 +523,86 @@ class HTMLRenderer(BaseRenderer):
         Returns:
             HTML string with inline markup
         """
-        result = ''
+        # Fast path: leaf element with text only (the common case)
+        if len(elem) == 0:
+            if not elem.text:
+                return ''
+            text = self.process_text_for_html(elem.text)
+            return html_module.escape(text) if context.xhtml else text
+
+        parts = []
 
         # Add initial text
         if elem.text:
             text = self.process_text_for_html(elem.text)
             if context.xhtml:
-                result = html_module.escape(text)
+                parts.append(html_module.escape(text))
             else:
-                result = text
+                parts.append(text)
 
         # Process child elements
         for child in elem:
             if not isinstance(child.tag, str):
                 continue
 
-            tag = self.strip_namespace(child.tag)
+            tag = local_tag(child.tag)
 
             if tag == 'lb':
                 # Line break
-                result += '<br/>' if context.xhtml else '<br>'
+                parts.append('<br/>' if context.xhtml else '<br>')
 
             elif tag == 'quote':
                 # Nested inline quote - increment depth
                 child_context = context.with_deeper_quote()
                 child_text = self.render_text_content(child, child_context)
                 open_quote, close_quote = self.get_smart_quotes(context.quote_depth)
-                result += f'{open_quote}{child_text}{close_quote}'
-
-            elif tag == 'hi':
-                # Highlighted text
-                rend = child.get('rend', 'italic')
-                child_text = self.extract_plain_text(child)
-                if context.xhtml:
-                    child_text = html_module.escape(child_text)
-
-                if rend == 'italic':
-                    result += f'<i>{child_text}</i>'
-                elif rend == 'bold':
-                    result += f'<b>{child_text}</b>'
-                else:
-                    result += f'<span class="{rend}">{child_text}</span>'
+                parts.append(f'{open_quote}{child_text}{close_quote}')
 
-            elif tag == 'emph':
-                # Emphasis
+            else:
+                # All other inline elements wrap their plain text
                 child_text = self.extract_plain_text(child)
                 if context.xhtml:
                     child_text = html_module.escape(child_text)
-                result += f'<em>{child_text}</em>'
-
-            elif tag == 'ref':
-                # Reference/link
-                target = child.get('target', '#')
 
-                # Handle cross-references
-                if context.id_map and not target.startswith(('#', 'http://', 'https://', '//')):
-                    if target in context.id_map:
-                        target_file = context.id_map[target]
-                        target = f'{target_file}#{target}'
+                if tag == 'hi':
+                    # Highlighted text
+                    rend = child.get('rend', 'italic')
+                    template = _HI_TEMPLATES.get(rend)
+                    if template is not None:
+                        parts.append(template(child_text))
                     else:
+                        parts.append(f'<span class="{rend}">{child_text}</span>')
+
+                elif tag == 'ref':
+                    # Reference/link
+                    target = child.get('target', '#')
+
+                    # Handle cross-references
+                    if context.id_map and not target.startswith(('#', 'http://', 'https://', '//')):
+                        if target in context.id_map:
+                            target_file = context.id_map[target]
+                            target = f'{target_file}#{target}'
+                        else:
+                            target = '#' + target
+                    elif not target.startswith(('#', 'http://', 'https://', '//')):
                         target = '#' + target
-                elif not target.startswith(('#', 'http://', 'https://', '//')):
-                    target = '#' + target
-
-                child_text = self.extract_plain_text(child)
-                if context.xhtml:
-                    child_text = html_module.escape(child_text)
-                result += f'<a href="{target}">{child_text}</a>'
-
-            elif tag == 'note':
-                # Footnote/annotation
-                child_text = self.extract_plain_text(child)
-                if context.xhtml:
-                    child_text = html_module.escape(child_text)
-                result += f'<sup>[{child_text}]</sup>'
-
-            elif tag == 'foreign':
-                # Foreign language text
-                child_text = self.extract_plain_text(child)
-                if context.xhtml:
-                    child_text = html_module.escape(child_text)
-                result += f'<i>{child_text}</i>'
 
-            elif tag == 'title':
-                # Title of a work
-                child_text = self.extract_plain_text(child)
-                if context.xhtml:
-                    child_text = html_module.escape(child_text)
-                result += f'<i>{child_text}</i>'
+                    if context.xhtml:
+                        target = html_module.escape(target)
+                    parts.append(_LINK(target, child_text))
 
-            else:
-                # Unknown inline element - just extract text
-                child_text = self.extract_plain_text(child)
-                if context.xhtml:
-                    child_text = html_module.escape(child_text)
-                result += child_text
+                else:
+                    # emph, note, foreign and title have fixed wrappers;
+                    # unknown inline elements contribute just their text
+                    template = _INLINE_TEMPLATES.get(tag)
+                    parts.append(template(child_text) if template is not None else child_text)
 
             # Add tail text
             if child.tail:
                 tail = self.process_text_for_html(child.tail)
                 if context.xhtml:
-                    result += html_module.escape(tail)
+                    parts.append(html_module.escape(tail))
                 else:
-                    result += tail
+                    parts.append(tail)
 
-        return result
+        return ''.join(parts)
@@ -7,13 +7,69 @@ Uses the visitor pattern with proper context management for recursive rendering.
 
 import textwrap
 import re
+from itertools import zip_longest
 from typing import List
 from lxml import etree
 
-from ..core.base_renderer import BaseRenderer, TEI_NS, EMDASH_TOKEN
+from ..core.base_renderer import (BaseRenderer, EMDASH_TOKEN, QUOTE_BLOCK_TAG_NAMES,
+                                  SMART_QUOTES)
 from ..core.context import RenderContext
 from ..core.traverser import TEITraverser
-from ..common import get_title
+from ..common import get_title, TEI_TAG_PREFIX, TEI_HEAD, TEI_ITEM, TEI_ROW, TEI_CELL
+
+# Namespaced tags compared directly against child.tag
+_LG = TEI_TAG_PREFIX + 'lg'
+_L = TEI_TAG_PREFIX + 'l'
+_LB = TEI_TAG_PREFIX + 'lb'
+_QUOTE = TEI_TAG_PREFIX + 'quote'
+
+# Inline elements rendered as plain text between (open, close) markers.
+# Anything not listed here is rendered as unmarked plain text.
+_INLINE_MARKERS = {
+    TEI_TAG_PREFIX + 'emph': ('_', '_'),
+    TEI_TAG_PREFIX + 'hi': ('_', '_'),
+    TEI_TAG_PREFIX + 'title': ('_', '_'),
+    TEI_TAG_PREFIX + 'foreign': ('_', '_'),
+    TEI_TAG_PREFIX + 'note': (' [', ']'),
+    TEI_TAG_PREFIX + 'ref': ('', ''),
+}
+_NO_MARKERS = ('', '')
+
+# Extra indentation for verse lines by rend value: lines inside a stanza
+# (added before the stanza's base indent) and lines directly in an <lg>
+# (which include the 4-space base indent themselves)
+_STANZA_LINE_INDENTS = {'indent': '  ', 'indent2': '    ', 'indent3': '      '}
+_VERSE_LINE_INDENTS = {'indent': '      ', 'indent2': '        ', 'indent3': '          '}
+
+# Section break for milestones with rend="stars", and the space-count
+# pattern for rend="space", "space2", "space3", ...
+_STARS = '*       *       *       *       *'
+_SPACE_RE = re.compile(r'space(\d+)?')
+
+# Matches an _emphasis_ marker pair (see _visual_length)
+_EMPHASIS_RE = re.compile(r'_([^_]+)_')
+
+# Matches any whitespace that ' '.join(text.split()) would change:
+# non-space whitespace, double spaces, or leading/trailing spaces
+_UNNORMALIZED_WS_RE = re.compile(r'[^\S ]|  |^ | $')
+
+
+def _normalize_whitespace(text: str) -> str:
+    """
+    Collapse runs of whitespace to single spaces and strip the ends.
+
+    Same result as ' '.join(text.split()), but returns already-normal
+    text unchanged without splitting and re-joining it.
+
+    Args:
+        text: Text to normalize
+
+    Returns:
+        Normalized text
+    """
+    if _UNNORMALIZED_WS_RE.search(text) is None:
+        return text
+    return ' '.join(text.split())
 
 
 class TextRenderer(BaseRenderer):
@@ -34,6 +90,26 @@ class TextRenderer(BaseRenderer):
         self.line_width = line_width
         self.title = ''
 
+        # Centered section-break line; depends only on the line width
+        self._stars_line = ' ' * ((line_width - len(_STARS)) // 2) + _STARS
+
+        # TextWrapper instances keyed by (width, initial_indent, subsequent_indent)
+        self._wrappers = {}
+
+        # Block element handlers, keyed by tag name without namespace
+        self._handlers = {
+            'div': self.render_div,
+            'head': self.render_head,
+            'p': self.render_paragraph,
+            'quote': self.render_quote,
+            'lg': self.render_line_group,
+            'list': self.render_list,
+            'table': self.render_table,
+            'figure': self.render_figure,
+            'milestone': self.render_milestone,
+            'signed': self.render_signed,
+        }
+
     def extract_plain_text(self, elem: etree._Element) -> str:
         """
         Extract all text content from element with em-dash processing.
@@ -105,44 +181,17 @@ class TextRenderer(BaseRenderer):
             List of output lines
         """
         # Dispatch to specific handler
-        if tag == 'div':
-            return self.render_div(elem, context, traverser)
-        elif tag == 'head':
-            return self.render_head(elem, context, traverser)
-        elif tag == 'p':
-            return self.render_paragraph(elem, context, traverser)
-        elif tag == 'quote':
-            return self.render_quote(elem, context, traverser)
-        elif tag == 'lg':
-            return self.render_line_group(elem, context, traverser)
-        elif tag == 'list':
-            return self.render_list(elem, context, traverser)
-        elif tag == 'table':
-            return self.render_table(elem, context, traverser)
-        elif tag == 'figure':
-            return self.render_figure(elem, context, traverser)
-        elif tag == 'milestone':
-            return self.render_milestone(elem, context, traverser)
-        elif tag == 'signed':
-            return self.render_signed(elem, context, traverser)
-        else:
+        handler = self._handlers.get(tag)
+        if handler is None:
             # Unknown element - skip
             return []
+        return handler(elem, context, traverser)
 
     def render_div(self, elem: etree._Element, context: RenderContext,
                    traverser: TEITraverser) -> List[str]:
         """Render a div element."""
-        lines = []
         child_context = context.with_parent('div')
-        children = self.render_children(elem, child_context, traverser)
-
-        for child in children:
-            if isinstance(child, list):
-                lines.extend(child)
-            else:
-                lines.append(child)
-
-        return lines
+        return self.render_children(elem, child_context, traverser)
 
     def render_head(self, elem: etree._Element, context: RenderContext,
                     traverser: TEITraverser) -> List[str]:
@@ -178,27 +227,21 @@ class TextRenderer(BaseRenderer):
     def render_paragraph(self, elem: etree._Element, context: RenderContext,
                         traverser: TEITraverser) -> List[str]:
         """Render a paragraph with text wrapping."""
+        if elem.text is None and len(elem) == 0:
+            # Empty <p/>: nothing to extract
+            return []
+
         text = self._extract_text_with_emphasis(elem, context).strip()
         if not text:
             return []
 
         # Normalize whitespace (collapse internal line breaks)
-        normalized = ' '.join(text.split())
+        normalized = _normalize_whitespace(text)
 
         # Wrap text with indentation
         # Reduce width for nested contexts to create true narrowing effect
         effective_width = self.line_width - (context.indent_level * 4)
-        wrapped = textwrap.fill(
-            normalized,
-            width=effective_width,
-            initial_indent=context.current_indent,
-            subsequent_indent=context.current_indent,
-            break_long_words=False,
-            break_on_hyphens=False
-        )
-
-        # Split into lines
-        lines = wrapped.split('\n')
+        lines = self._wrap_normalized(normalized, effective_width, context.current_indent)
         lines.append('')  # Blank line after paragraph
         return lines
 
@@ -217,22 +260,16 @@ class TextRenderer(BaseRenderer):
         child_context = context.with_indent(1).with_deeper_block()
 
         # Find block-level children
-        block_children = [child for child in elem
-                        if isinstance(child.tag, str) and
-                        self.strip_namespace(child.tag) in
-                        ['p', 'lg', 'list', 'table', 'figure', 'div', 'quote', 'signed']]
+        block_children = list(elem.iterchildren(*QUOTE_BLOCK_TAG_NAMES))
 
         if block_children:
             lines = []
             for child in block_children:
-                child_tag = self.strip_namespace(child.tag)
+                child_tag = QUOTE_BLOCK_TAG_NAMES[child.tag]
                 grandchild_context = child_context.with_parent(child_tag)
                 result = traverser.traverse_element(child, grandchild_context)
                 if result:
-                    if isinstance(result, list):
-                        lines.extend(result)
-                    else:
-                        lines.append(result)
+                    lines.extend(result)
             return lines
         else:
             # Fallback: wrap text with indentation
@@ -240,19 +277,11 @@ class TextRenderer(BaseRenderer):
             if not text:
                 return []
 
-            normalized = ' '.join(text.split())
+            normalized = _normalize_whitespace(text)
 
             effective_width = self.line_width - (child_context.indent_level * 4)
-            wrapped = textwrap.fill(
-                normalized,
-                width=effective_width,
-                initial_indent=child_context.current_indent,
-                subsequent_indent=child_context.current_indent,
-                break_long_words=False,
-                break_on_hyphens=False
-            )
-
-            lines = wrapped.split('\n')
+            lines = self._wrap_normalized(normalized, effective_width,
+                                          child_context.current_indent)
             lines.append('')
             return lines
 
@@ -267,9 +296,9 @@ class TextRenderer(BaseRenderer):
             if not isinstance(child.tag, str):
                 continue
 
-            child_tag = self.strip_namespace(child.tag)
+            child_tag = child.tag
 
-            if child_tag == 'head':
+            if child_tag == TEI_HEAD:
                 # Poem title
                 title = self.extract_plain_text(child).strip()
                 if title:
@@ -280,12 +309,12 @@ class TextRenderer(BaseRenderer):
                         lines.append(context.current_indent + '    ' + title.upper())
                     lines.append('')
 
-            elif child_tag == 'lg':
+            elif child_tag == _LG:
                 # Nested stanza
                 stanza_lines = self._render_stanza(child, context)
                 lines.extend(stanza_lines)
 
-            elif child_tag == 'l':
+            elif child_tag == _L:
                 # Line of verse (not in stanza)
                 line_text = self._extract_text_with_emphasis(child, context).strip()
                 line_rend = child.get('rend', '')
@@ -296,10 +325,7 @@ class TextRenderer(BaseRenderer):
                 # Other block elements in poem
                 result = traverser.traverse_element(child, child_context)
                 if result:
-                    if isinstance(result, list):
-                        lines.extend(result)
-                    else:
-                        lines.append(result)
+                    lines.extend(result)
 
         lines.append('')  # Blank after poem
         return lines
@@ -307,48 +333,45 @@ class TextRenderer(BaseRenderer):
     def _render_stanza(self, stanza_elem: etree._Element, context: RenderContext) -> List[str]:
         """Render a stanza (nested lg)."""
         stanza_lines = []
-        stanza_rend = stanza_elem.get('rend', '')
-        line_texts = []
-        line_rends = []
+        center_stanza = stanza_elem.get('rend', '') == 'center'
+        # Base indentation for lines of a non-centered stanza
+        base_indent = context.current_indent + '    '
+        # Widest visual line length, only needed (and tracked) when the
+        # whole stanza is centered
+        max_len = 0
 
         for child in stanza_elem:
             if not isinstance(child.tag, str):
                 continue
 
-            child_tag = self.strip_namespace(child.tag)
-            if child_tag == 'l':
+            if child.tag == _L:
                 line_text = self._extract_text_with_emphasis(child, context).strip()
                 line_rend = child.get('rend', '')
-                line_rends.append(line_rend)
 
                 # Apply individual line rendering
                 # Check if 'center' is in the rend attribute (may have multiple classes)
                 if 'center' in line_rend.split():
-                    padding = (self.line_width - self._visual_length(line_text)) // 2
-                    line_text = ' ' * padding + line_text
-                elif line_rend == 'indent':
-                    line_text = '  ' + line_text
-                elif line_rend == 'indent2':
-                    line_text = '    ' + line_text
-                elif line_rend == 'indent3':
-                    line_text = '      ' + line_text
+                    # Already centered: never given the stanza's base indent
+                    visual_len = self._visual_length(line_text)
+                    prefix = ' ' * ((self.line_width - visual_len) // 2)
+                elif center_stanza:
+                    prefix = _STANZA_LINE_INDENTS.get(line_rend, '')
+                    visual_len = self._visual_length(line_text)
+                else:
+                    # Non-centered stanza: the final line is built in one step
+                    stanza_lines.append(base_indent + _STANZA_LINE_INDENTS.get(line_rend, '')
+                                        + line_text)
+                    continue
 
-                line_texts.append(line_text)
+                stanza_lines.append(prefix + line_text)
+                visual_len += len(prefix)
+                if visual_len > max_len:
+                    max_len = visual_len
 
         # Apply stanza-level centering if needed
-        if stanza_rend == 'center' and line_texts:
-            max_len = max(self._visual_length(l) for l in line_texts)
-            block_padding = (self.line_width - max_len) // 2
-            for line_text in line_texts:
-                stanza_lines.append(' ' * block_padding + line_text)
-        else:
-            # Add base indentation for non-centered stanzas
-            for i, line_text in enumerate(line_texts):
-                if i < len(line_rends) and 'center' in line_rends[i].split():
-                    # Already centered
-                    stanza_lines.append(line_text)
-                else:
-                    stanza_lines.append(context.current_indent + '    ' + line_text)
+        if center_stanza and stanza_lines:
+            block_padding = ' ' * ((self.line_width - max_len) // 2)
+            stanza_lines = [block_padding + line_text for line_text in stanza_lines]
 
         stanza_lines.append('')  # Blank after stanza
         return stanza_lines
@@ -359,14 +382,8 @@ class TextRenderer(BaseRenderer):
         if 'center' in line_rend.split():
             padding = (self.line_width - self._visual_length(line_text)) // 2
             return ' ' * padding + line_text
-        elif line_rend == 'indent':
-            return context.current_indent + '      ' + line_text
-        elif line_rend == 'indent2':
-            return context.current_indent + '        ' + line_text
-        elif line_rend == 'indent3':
-            return context.current_indent + '          ' + line_text
         else:
-            return context.current_indent + '    ' + line_text
+            return context.current_indent + _VERSE_LINE_INDENTS.get(line_rend, '    ') + line_text
 
     def render_list(self, elem: etree._Element, context: RenderContext,
                    traverser: TEITraverser) -> List[str]:
@@ -374,7 +391,7 @@ class TextRenderer(BaseRenderer):
         lines = []
         child_context = context.with_parent('list')
 
-        for item in elem.findall('tei:item', TEI_NS):
+        for item in elem.iterchildren(TEI_ITEM):
             item_context = child_context.with_parent('item')
             item_text = self._extract_text_with_emphasis(item, item_context).strip()
             if item_text:
@@ -382,15 +399,8 @@ class TextRenderer(BaseRenderer):
                 indent = context.current_indent
                 effective_width = self.line_width - (context.indent_level * 4)
 
-                wrapped = textwrap.fill(
-                    item_text,
-                    width=effective_width,
-                    initial_indent=indent + '  • ',
-                    subsequent_indent=indent + '    ',
-                    break_long_words=False,
-                    break_on_hyphens=False
-                )
-                lines.append(wrapped)
+                lines.extend(self._wrap_text(item_text, effective_width,
+                                             indent + '  • ', indent + '    '))
 
         lines.append('')  # Blank after list
         return lines
@@ -399,30 +409,24 @@ class TextRenderer(BaseRenderer):
                     traverser: TEITraverser) -> List[str]:
         """Render a simple text table."""
         lines = []
-        rows_data = []
 
         # Collect all cell data
-        for row in elem.findall('tei:row', TEI_NS):
-            cells = []
-            for cell in row.findall('tei:cell', TEI_NS):
-                cell_text = self.extract_plain_text(cell).strip()
-                cells.append(cell_text)
+        rows_data = []
+        for row in elem.iterchildren(TEI_ROW):
+            cells = [self.extract_plain_text(cell).strip() for cell in row.iterchildren(TEI_CELL)]
             if cells:
                 rows_data.append(cells)
 
         if rows_data:
-            # Calculate column widths
-            num_cols = max(len(row) for row in rows_data)
-            col_widths = [0] * num_cols
-            for row in rows_data:
-                for i, cell in enumerate(row):
-                    col_widths[i] = max(col_widths[i], len(cell))
+            # Column widths from the transposed cell data (short rows padded)
+            col_widths = [max(map(len, column))
+                          for column in zip_longest(*rows_data, fillvalue='')]
 
             # Render table with indentation
             indent = context.current_indent
             for row in rows_data:
                 row_text = '  '.join(
-                    cell.ljust(col_widths[i]) for i, cell in enumerate(row)
+                    cell.ljust(width) for cell, width in zip(row, col_widths)
                 )
                 lines.append(indent + '  ' + row_text)
 
@@ -435,22 +439,17 @@ class TextRenderer(BaseRenderer):
         lines = []
 
         # Get caption from head element
-        head = elem.find('tei:head', TEI_NS)
+        head = next(elem.iterchildren(TEI_HEAD), None)
         if head is not None:
             caption = self.extract_plain_text(head).strip()
             if caption:
                 indent = context.current_indent
                 effective_width = self.line_width - (context.indent_level * 4)
 
-                wrapped = textwrap.fill(
-                    f'[Illustration: {caption}]',
-                    width=effective_width,
-                    initial_indent=indent,
-                    subsequent_indent=indent,
-                    break_long_words=False,
-                    break_on_hyphens=False
-                )
-                lines.extend(wrapped.split('\n'))
+                # The prefix is wrapped with the caption, so a line break may
+                # follow '[Illustration:' when the first word is long
+                lines.extend(self._wrap_text(f'[Illustration: {caption}]',
+                                             effective_width, indent, indent))
             else:
                 lines.append(context.current_indent + '[Illustration]')
         else:
@@ -465,15 +464,12 @@ class TextRenderer(BaseRenderer):
         rend = self.get_rend_class(elem, default='space')
 
         if rend == 'stars':
-            # Center the asterisks
-            stars = '*       *       *       *       *'
-            padding = (self.line_width - len(stars)) // 2
-            return [' ' * padding + stars, '']
+            # Centered asterisks, built once per renderer
+            return [self._stars_line, '']
         elif rend.startswith('space'):
             # Extract number from space, space2, space3, etc.
             # Default to 1 blank line for 'space', or parse the number
-            import re
-            match = re.match(r'space(\d+)?', rend)
+            match = _SPACE_RE.match(rend)
             if match and match.group(1):
                 num_lines = int(match.group(1))
             else:
@@ -515,6 +511,10 @@ class TextRenderer(BaseRenderer):
         Uses underscores to mark emphasis in plain text.
         Properly handles nested inline quotes with context.
 
+        Nested quotes are walked iteratively with an explicit stack rather
+        than by recursion. Each stack entry holds the remaining children of
+        an open quote, its quote depth, closing quote mark and tail text.
+
         Args:
             elem: Element to extract text from
             context: Current rendering context
@@ -522,57 +522,155 @@ class TextRenderer(BaseRenderer):
         Returns:
             Text string with emphasis markers
         """
-        result = ''
+        process = self.process_text_for_output
+
+        # Fast path: plain text with no inline children
+        if len(elem) == 0:
+            return process(elem.text) if elem.text else ''
+
+        parts = []
 
         if elem.text:
-            result = self.process_text_for_output(elem.text)
+            parts.append(process(elem.text))
+
+        stack = [(iter(elem), context.quote_depth, '', None)]
+
+        while stack:
+            children, quote_depth, close_quote, quote_tail = stack[-1]
+            child = next(children, None)
+
+            if child is None:
+                # Finished this element - close its quote and add its tail
+                stack.pop()
+                parts.append(close_quote)
+                if quote_tail:
+                    parts.append(process(quote_tail))
+                continue
 
-        for child in elem:
             if not isinstance(child.tag, str):
                 continue
 
-            tag = self.strip_namespace(child.tag)
+            tag = child.tag
 
-            if tag == 'lb':
+            if tag == _LB:
                 # Line break
-                result += '\n'
-
-            elif tag == 'quote':
-                # Nested inline quote - use context for depth
-                child_context = context.with_deeper_quote()
-                child_text = self._extract_text_with_emphasis(child, child_context)
-                open_quote, close_quote = self.get_smart_quotes(context.quote_depth)
-                result += f'{open_quote}{child_text}{close_quote}'
-
-            elif tag in ['emph', 'hi']:
-                # Emphasis - mark with underscores
-                child_text = self.extract_plain_text(child)
-                result += f'_{child_text}_'
-
-            elif tag == 'note':
-                # Footnote
-                child_text = self.extract_plain_text(child)
-                result += f' [{child_text}]'
-
-            elif tag == 'ref':
-                # Reference - just include the text
-                child_text = self.extract_plain_text(child)
-                result += child_text
-
-            elif tag in ['title', 'foreign']:
-                # Title/foreign - mark like emphasis
-                child_text = self.extract_plain_text(child)
-                result += f'_{child_text}_'
+                parts.append('\n')
+
+            elif tag == _QUOTE:
+                # Nested inline quote - descend with incremented depth
+                open_quote, child_close = SMART_QUOTES[quote_depth % 2]
+                parts.append(open_quote)
+                if child.text:
+                    parts.append(process(child.text))
+                stack.append((iter(child), quote_depth + 1, child_close, child.tail))
+                continue
 
             else:
-                # Unknown inline element - just extract text
-                child_text = self.extract_plain_text(child)
-                result += child_text
+                # Emphasis/title/foreign get underscores, notes brackets;
+                # ref and unknown inline elements are just their text
+                open_mark, close_mark = _INLINE_MARKERS.get(tag, _NO_MARKERS)
+                parts.append(open_mark)
+                parts.append(self.extract_plain_text(child))
+                parts.append(close_mark)
 
             if child.tail:
-                result += self.process_text_for_output(child.tail)
+                parts.append(process(child.tail))
+
+        return ''.join(parts)
+
+    def _wrap_normalized(self, text: str, width: int, indent: str) -> List[str]:
+        """
+        Greedily wrap whitespace-normalized text into indented lines.
+
+        Equivalent to textwrap with break_long_words=False and
+        break_on_hyphens=False, but only valid for text whose words are
+        separated by single spaces (as produced by ' '.join(text.split())).
+        Words longer than the available width get a line of their own.
+
+        Args:
+            text: Normalized text to wrap
+            width: Maximum line width including indentation
+            indent: Prefix for every line
+
+        Returns:
+            List of wrapped lines
+        """
+        available = width - len(indent)
+        if len(text) <= available:
+            # Fits on one line: nothing to split
+            return [indent + text]
+
+        lines = []
+        current = []
+        current_len = 0
+
+        for word in text.split(' '):
+            if current and current_len + 1 + len(word) > available:
+                lines.append(indent + ' '.join(current))
+                current = [word]
+                current_len = len(word)
+            elif current:
+                current.append(word)
+                current_len += 1 + len(word)
+            else:
+                current = [word]
+                current_len = len(word)
 
-        return result
+        if current:
+            lines.append(indent + ' '.join(current))
+
+        return lines
+
+    def _wrap_text(self, text: str, width: int, initial_indent: str,
+                   subsequent_indent: str) -> List[str]:
+        """
+        Wrap text like TextWrapper.wrap(), skipping it for one-line text.
+
+        Text that fits after initial_indent, and that has no whitespace
+        TextWrapper would rewrite or drop (tabs, newlines, a trailing
+        space), comes back unchanged on a single line.
+
+        Args:
+            text: Text to wrap
+            width: Maximum line width including indentation
+            initial_indent: Prefix for the first line
+            subsequent_indent: Prefix for continuation lines
+
+        Returns:
+            List of wrapped lines
+        """
+        if (text and len(initial_indent) + len(text) <= width
+                and text.isprintable() and text[-1] != ' '):
+            return [initial_indent + text]
+        return self._get_wrapper(width, initial_indent, subsequent_indent).wrap(text)
+
+    def _get_wrapper(self, width: int, initial_indent: str,
+                     subsequent_indent: str) -> textwrap.TextWrapper:
+        """
+        Get a cached TextWrapper for the given width and indentation.
+
+        Wrappers never break long words or hyphenated words.
+
+        Args:
+            width: Maximum line width including indentation
+            initial_indent: Prefix for the first line
+            subsequent_indent: Prefix for continuation lines
+
+        Returns:
+            Configured TextWrapper instance
+        """
+        key = (width, initial_indent, subsequent_indent)
+        wrapper = self._wrappers.get(key)
+        if wrapper is None:
+            wrapper = textwrap.TextWrapper(
+                width=width,
+                initial_indent=initial_indent,
+                subsequent_indent=subsequent_indent,
+                break_long_words=False,
+                break_on_hyphens=False
+            )
+            self._wrappers[key] = wrapper
+        return wrapper
 
     def _visual_length(self, text: str) -> int:
         """
@@ -584,6 +682,8 @@ class TextRenderer(BaseRenderer):
         Returns:
             Visual length without markers
         """
-        # Remove underscore pairs that mark emphasis
-        visual = re.sub(r'_([^_]+)_', r'\1', text)
-        return len(visual)
+        if '_' not in text:
+            return len(text)
+        # Each emphasis marker pair hides two characters; count the pairs
+        # rather than building the text with them removed
+        return len(text) - 2 * len(_EMPHASIS_RE.findall(text))
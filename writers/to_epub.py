@@ -7,28 +7,137 @@ in to_epub_old.py for reference.
 """
 
 import os
-import tempfile
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from itertools import islice
 from lxml import etree
 import html
 
-from .common import parse_tei, get_title, TEI_NS
+from .common import (parse_tei, get_metadata, find_text_parts, atomic_output, XML_ID,
+                     TEI_DIV, TEI_HEAD, plain_text)
 from .renderers.epub_renderer import EPUBRenderer
-from .epub_image_utils import collect_graphic_urls, copy_images_to_epub
+from .epub_image_utils import collect_graphic_urls, add_images_to_epub, COVER_FILENAMES
 
+# Contents of the mimetype entry, already encoded
+_MIMETYPE = b'application/epub+zip'
 
-def convert(tei_file, output_file):
+# Fixed contents of META-INF/container.xml and the default stylesheet
+_CONTAINER_XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>'''
+_EPUB_CSS = '''body { max-width: 40em; margin: 2em auto; padding: 0 1em; font-family: serif; line-height: 1.6; }
+h1 { text-align: center; }
+h2 { margin-top: 2em; }
+.italic { font-style: italic; }
+.bold { font-weight: bold; }
+.underline { text-decoration: underline; }
+.small-caps { font-variant: small-caps; }
+.signature { text-align: right; font-style: italic; margin-top: 0.5em; }
+blockquote { margin: 1em 2em; }
+figure { margin: 2em auto; width: 80%; max-width: 100%; text-align: center; }
+figure.left { float: left; margin: 0 2em 1em 0; width: 50%; max-width: 50%; }
+figure.right { float: right; margin: 0 0 1em 2em; width: 50%; max-width: 50%; }
+figure.center { margin: 2em auto; display: block; }
+figure img { width: 100%; height: auto; }
+figcaption { margin-top: 0.5em; font-style: italic; }
+.poem { margin: 2em 0; }
+.poem.center { text-align: center; }
+.poem.center .stanza { display: inline-block; text-align: left; }
+.poem-title { text-align: center; font-weight: bold; margin-bottom: 1em; }
+.stanza { margin-bottom: 1em; }
+.line { margin-top: 0; margin-bottom: 0; }
+.indent { margin-left: 2em; }
+.indent2 { margin-left: 4em; }
+.indent3 { margin-left: 6em; }
+.center { text-align: center; }
+.milestone { text-align: center; margin: 0; }
+.milestone.stars { margin: 1.25em 0; }
+.milestone.stars::before { content: "*       *       *       *       *"; white-space: pre; }
+.milestone.space { height: 1.25em; }
+.milestone[class*="space"] { height: 1.25em; }
+.milestone.space2 { height: 2.5em; }
+.milestone.space3 { height: 3.75em; }
+.milestone.space4 { height: 5em; }
+.milestone.space5 { height: 6.25em; }
+table { border-collapse: collapse; margin: 1em 0; }
+td, th { border: 1px solid #ccc; padding: 0.5em; }
+'''
+
+# Fixed parts of the navigation and package documents
+_NAV_DOCUMENT = '''<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
+<head>
+  <title>Table of Contents</title>
+  <link rel="stylesheet" type="text/css" href="styles.css"/>
+</head>
+<body>
+  <nav epub:type="toc" id="toc">
+    <h1>{title}</h1>
+    <ol>
+{entries}    </ol>
+  </nav>
+</body>
+</html>'''.format
+_NAV_ENTRY = '      <li><a href="{}">{}</a></li>\n'.format
+_OPF_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <dc:identifier id="book-id">{book_id}</dc:identifier>
+    <dc:title>{title}</dc:title>
+    <dc:language>{lang}</dc:language>
+    <dc:creator>{author}</dc:creator>
+    <meta property="dcterms:modified">{modified}</meta>'''.format
+_OPF_MANIFEST_HEADER = '''  <manifest>
+    <item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>
+    <item id="css" href="styles.css" media-type="text/css"/>'''
+_OPF_CHAPTER_ITEM = '    <item id="chapter{}" href="{}" media-type="application/xhtml+xml"/>'.format
+_OPF_IMAGE_ITEM = '    <item id="{}" href="{}" media-type="{}"/>'.format
+_OPF_ITEMREF = '    <itemref idref="chapter{}"/>'.format
+
+# Media types for manifest images by extension (anything else: image/png)
+_IMAGE_MIME = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.svg': 'image/svg+xml',
+}
+
+# Books with at least this many sections are rendered in a process pool;
+# below that, starting the workers costs more than it saves
+_PARALLEL_MIN_SECTIONS = 64
+
+# Elements carrying a non-empty xml:id, filtered by libxml2 rather than in Python
+_ELEMENTS_WITH_ID = etree.XPath("descendant-or-self::*[@xml:id != '']")
+
+
+def convert(tei_file, output_file, compresslevel=3, parallel=True):
     """
     Convert TEI XML to EPUB3 format.
 
     Args:
         tei_file: Path to TEI XML input file
         output_file: Path to EPUB output file
+        compresslevel: zlib level (0-9) for deflated entries. The default
+            of 3 compresses XHTML nearly as well as zlib's default of 6 in
+            roughly half the time.
+        parallel: Whether large books may be rendered in a process pool;
+            pass False when already running in a worker process
     """
     # Parse the TEI document
     doc = parse_tei(tei_file)
-    title = get_title(doc)
+
+    # Comments and processing instructions never reach the output; drop
+    # them in libxml2 so rendering never has to step over them
+    etree.strip_elements(doc, etree.Comment, etree.ProcessingInstruction, with_tail=False)
+    metadata = get_metadata(doc)
+    title = metadata['title']
 
     # Discover custom CSS files for EPUB
     from .common import find_css_files, read_css_files, filter_css_for_format
@@ -43,178 +152,138 @@ def convert(tei_file, output_file):
     if css_paths:
         print(f"Auto-detected CSS files: {', '.join([os.path.basename(p) for p in css_paths])}")
 
-    # Create temporary directory for EPUB assembly
-    temp_dir = tempfile.mkdtemp(prefix='epub_')
-
-    try:
-        # Create EPUB directory structure
-        meta_inf = os.path.join(temp_dir, 'META-INF')
-        oebps = os.path.join(temp_dir, 'OEBPS')
-        os.makedirs(meta_inf)
-        os.makedirs(oebps)
-
-        # Create mimetype file
-        with open(os.path.join(temp_dir, 'mimetype'), 'w', encoding='utf-8') as f:
-            f.write('application/epub+zip')
-
-        # Create container.xml
-        create_container_xml(meta_inf)
-
-        # Process images
-        image_map = {}
-        input_dir = os.path.dirname(os.path.abspath(tei_file))
-        image_urls = collect_graphic_urls(doc, input_dir)
-        if image_urls:
-            images_dir = os.path.join(oebps, 'images')
-            image_map = copy_images_to_epub(image_urls, input_dir, images_dir)
-
-        # Create CSS file with custom styles appended
-        css_content = create_css(custom_css_content)
-        with open(os.path.join(oebps, 'styles.css'), 'w', encoding='utf-8') as f:
-            f.write(css_content)
-
-        # Build ID mapping for cross-references
-        id_map = build_id_mapping(doc)
-
-        # Create renderer
-        renderer = EPUBRenderer()
-
-        # Generate book ID
-        book_id = f'urn:uuid:{title.replace(" ", "-").lower()}-{datetime.now().strftime("%Y%m%d")}'
-
-        # Process document sections
-        chapters = []
-        toc_entries = []
-
-        # Process front matter
-        front = doc.find('.//tei:front', TEI_NS)
-        if front is not None:
-            for i, div in enumerate(front.findall('tei:div', TEI_NS)):
-                filename = f'front{i+1}.xhtml'
-                chapter_title = get_div_title(div)
-                create_chapter_file(oebps, filename, div, title, renderer, id_map, image_map)
-                chapters.append({'filename': filename, 'title': chapter_title or f'Front Matter {i+1}'})
+    # Write the EPUB archive directly, with no staging directory. It goes to
+    # a temporary file that only replaces output_file once it is complete.
+    with atomic_output(output_file, binary=True) as f:
+        with zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED,
+                             compresslevel=compresslevel) as epub:
+            # mimetype must be the first entry and stored uncompressed
+            epub.writestr('mimetype', _MIMETYPE, compress_type=zipfile.ZIP_STORED)
+
+            # Create container.xml
+            epub.writestr('META-INF/container.xml', create_container_xml())
+
+            # Process images
+            image_map = {}
+            input_dir = os.path.dirname(os.path.abspath(tei_file))
+            image_urls = collect_graphic_urls(doc, input_dir)
+            if image_urls:
+                image_map = add_images_to_epub(image_urls, input_dir, epub, 'OEBPS')
+
+            # Create CSS file with custom styles appended
+            epub.writestr('OEBPS/styles.css', create_css(custom_css_content))
+
+            # Discover sections once; both the ID mapping and rendering use it
+            sections = collect_sections(doc)
+
+            # Build ID mapping for cross-references
+            id_map = build_id_mapping(doc, sections)
+
+            # Generate book ID
+            book_id = f'urn:uuid:{title.replace(" ", "-").lower()}-{datetime.now().strftime("%Y%m%d")}'
+
+            # Process document sections
+            chapters = []
+            toc_entries = []
+
+            # Chapter titles are extracted once, for both the TOC and the
+            # chapter heading (None for a body rendered whole)
+            chapter_titles = [None if fallback_title is None else get_div_title(section)
+                              for section, _, fallback_title in sections]
+            rendered = render_sections(sections, chapter_titles, title, id_map, image_map,
+                                       parallel)
+
+            for (section, filename, fallback_title), chapter_title, section_html in zip(
+                    sections, chapter_titles, rendered):
+                epub.writestr(f'OEBPS/{filename}', section_html)
+
+                # Everything later steps need (ids, titles, metadata) has been
+                # extracted already, so free the written section's subtree
+                section.clear(keep_tail=True)
+
+                if fallback_title is None:
+                    # Body has no divisions - treat entire body as single chapter
+                    chapters.append({'filename': filename, 'title': title})
+                    toc_entries.append({'filename': filename, 'title': title})
+                    continue
+
+                chapters.append({'filename': filename, 'title': chapter_title or fallback_title})
                 if chapter_title:
                     toc_entries.append({'filename': filename, 'title': chapter_title})
 
-        # Process body chapters
-        body = doc.find('.//tei:body', TEI_NS)
-        if body is not None:
-            body_divs = body.findall('tei:div', TEI_NS)
-            if body_divs:
-                # Body has divisions - process each as a chapter
-                for i, div in enumerate(body_divs):
-                    filename = f'chapter{i+1}.xhtml'
-                    chapter_title = get_div_title(div)
-                    create_chapter_file(oebps, filename, div, title, renderer, id_map, image_map)
-                    chapters.append({'filename': filename, 'title': chapter_title or f'Chapter {i+1}'})
-                    if chapter_title:
-                        toc_entries.append({'filename': filename, 'title': chapter_title})
-            else:
-                # Body has no divisions - treat entire body as single chapter
-                filename = 'chapter1.xhtml'
-                create_section_file(oebps, filename, body, title, renderer, id_map, image_map)
-                chapters.append({'filename': filename, 'title': title})
-                toc_entries.append({'filename': filename, 'title': title})
-
-        # Process back matter
-        back = doc.find('.//tei:back', TEI_NS)
-        if back is not None:
-            for i, div in enumerate(back.findall('tei:div', TEI_NS)):
-                if div.getparent().tag == f"{{{TEI_NS['tei']}}}back":
-                    filename = f'back{i+1}.xhtml'
-                    chapter_title = get_div_title(div)
-                    create_chapter_file(oebps, filename, div, title, renderer, id_map, image_map)
-                    chapters.append({'filename': filename, 'title': chapter_title or f'Back Matter {i+1}'})
-                    if chapter_title:
-                        toc_entries.append({'filename': filename, 'title': chapter_title})
-
-        # Create navigation document (EPUB3 requirement)
-        create_nav_doc(oebps, title, toc_entries)
-
-        # Create package document (OPF)
-        create_package_doc(oebps, title, book_id, chapters, doc, image_map)
-
-        # Create EPUB file
-        create_epub_archive(temp_dir, output_file)
-
-        print(f"EPUB conversion complete: {output_file}")
-
-    finally:
-        # Clean up temporary directory
-        import shutil
-        shutil.rmtree(temp_dir)
+            # Create navigation document (EPUB3 requirement)
+            epub.writestr('OEBPS/nav.xhtml', create_nav_doc(title, toc_entries))
+
+            # Create package document (OPF)
+            epub.writestr('OEBPS/content.opf',
+                          create_package_doc(title, book_id, chapters, metadata, image_map))
+
+    print(f"EPUB conversion complete: {output_file}")
 
 
 def get_div_title(div):
     """Extract title from div's head element."""
-    head = div.find('tei:head', TEI_NS)
-    if head is not None:
-        return ''.join(head.itertext()).strip()
-    return ''
+    head = next(div.iterchildren(TEI_HEAD), None)
+    if head is None:
+        return ''
+    return plain_text(head)
 
 
-def build_id_mapping(doc):
+def collect_sections(doc):
+    """
+    List the document sections that become EPUB content files.
+
+    Front matter, body and back matter divs are returned in reading order
+    as (element, filename, fallback_title) tuples. A body without divs is
+    returned whole with a fallback_title of None.
+    """
+    front, body, back = find_text_parts(doc)
+
+    # Front matter
+    sections = _div_sections(front, 'front', 'Front Matter')
+
+    # Body chapters
+    body_sections = _div_sections(body, 'chapter', 'Chapter')
+    if body_sections:
+        sections.extend(body_sections)
+    elif body is not None:
+        # Body has no divisions - use the entire body
+        sections.append((body, 'chapter1.xhtml', None))
+
+    # Back matter
+    sections.extend(_div_sections(back, 'back', 'Back Matter'))
+
+    return sections
+
+
+def _div_sections(parent, prefix, label):
+    """Return collect_sections() tuples for the child divs of parent (may be None)."""
+    if parent is None:
+        return []
+    return [(div, f'{prefix}{i}.xhtml', f'{label} {i}')
+            for i, div in enumerate(parent.iterchildren(TEI_DIV), 1)]
+
+
+def build_id_mapping(doc, sections=None):
     """Build a mapping of XML IDs to their containing filenames."""
-    id_map = {}
+    if sections is None:
+        sections = collect_sections(doc)
 
-    # Process front matter
-    front = doc.find('.//tei:front', TEI_NS)
-    if front is not None:
-        for i, div in enumerate(front.findall('tei:div', TEI_NS)):
-            filename = f'front{i+1}.xhtml'
-            collect_ids_from_div(div, filename, id_map)
-
-    # Process body chapters
-    body = doc.find('.//tei:body', TEI_NS)
-    if body is not None:
-        body_divs = body.findall('tei:div', TEI_NS)
-        if body_divs:
-            # Body has divisions
-            for i, div in enumerate(body_divs):
-                filename = f'chapter{i+1}.xhtml'
-                collect_ids_from_div(div, filename, id_map)
-        else:
-            # Body has no divisions - collect IDs from entire body
-            filename = 'chapter1.xhtml'
-            collect_ids_from_div(body, filename, id_map)
-
-    # Process back matter
-    back = doc.find('.//tei:back', TEI_NS)
-    if back is not None:
-        for i, div in enumerate(back.findall('tei:div', TEI_NS)):
-            if div.getparent().tag == f"{{{TEI_NS['tei']}}}back":
-                filename = f'back{i+1}.xhtml'
-                collect_ids_from_div(div, filename, id_map)
+    id_map = {}
+    for section, filename, _ in sections:
+        collect_ids_from_div(section, filename, id_map)
 
     return id_map
 
 
 def collect_ids_from_div(div, filename, id_map):
     """Collect all XML IDs from a div and its descendants."""
-    # Check div itself for ID
-    div_id = div.get('{http://www.w3.org/XML/1998/namespace}id', '')
-    if div_id:
-        id_map[div_id] = filename
+    id_map.update((elem.get(XML_ID), filename) for elem in _ELEMENTS_WITH_ID(div))
 
-    # Check all descendant elements for IDs
-    for elem in div.iter():
-        elem_id = elem.get('{http://www.w3.org/XML/1998/namespace}id', '')
-        if elem_id:
-            id_map[elem_id] = filename
 
-
-def create_container_xml(meta_inf):
-    """Create META-INF/container.xml"""
-    container = '''<?xml version="1.0" encoding="UTF-8"?>
-<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
-  <rootfiles>
-    <rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>
-  </rootfiles>
-</container>'''
-
-    with open(os.path.join(meta_inf, 'container.xml'), 'w', encoding='utf-8') as f:
-        f.write(container)
+def create_container_xml():
+    """Return the contents of META-INF/container.xml"""
+    return _CONTAINER_XML
 
 
 def create_css(custom_css_content=None):
@@ -227,203 +296,150 @@ def create_css(custom_css_content=None):
     Returns:
         Complete CSS content as string
     """
-    css = '''body { max-width: 40em; margin: 2em auto; padding: 0 1em; font-family: serif; line-height: 1.6; }
-h1 { text-align: center; }
-h2 { margin-top: 2em; }
-.italic { font-style: italic; }
-.bold { font-weight: bold; }
-.underline { text-decoration: underline; }
-.small-caps { font-variant: small-caps; }
-.signature { text-align: right; font-style: italic; margin-top: 0.5em; }
-blockquote { margin: 1em 2em; }
-figure { margin: 2em auto; width: 80%; max-width: 100%; text-align: center; }
-figure.left { float: left; margin: 0 2em 1em 0; width: 50%; max-width: 50%; }
-figure.right { float: right; margin: 0 0 1em 2em; width: 50%; max-width: 50%; }
-figure.center { margin: 2em auto; display: block; }
-figure img { width: 100%; height: auto; }
-figcaption { margin-top: 0.5em; font-style: italic; }
-.poem { margin: 2em 0; }
-.poem.center { text-align: center; }
-.poem.center .stanza { display: inline-block; text-align: left; }
-.poem-title { text-align: center; font-weight: bold; margin-bottom: 1em; }
-.stanza { margin-bottom: 1em; }
-.line { margin-top: 0; margin-bottom: 0; }
-.indent { margin-left: 2em; }
-.indent2 { margin-left: 4em; }
-.indent3 { margin-left: 6em; }
-.center { text-align: center; }
-.milestone { text-align: center; margin: 0; }
-.milestone.stars { margin: 1.25em 0; }
-.milestone.stars::before { content: "*       *       *       *       *"; white-space: pre; }
-.milestone.space { height: 1.25em; }
-.milestone[class*="space"] { height: 1.25em; }
-.milestone.space2 { height: 2.5em; }
-.milestone.space3 { height: 3.75em; }
-.milestone.space4 { height: 5em; }
-.milestone.space5 { height: 6.25em; }
-table { border-collapse: collapse; margin: 1em 0; }
-td, th { border: 1px solid #ccc; padding: 0.5em; }
-'''
-
     # Append custom CSS if provided
     if custom_css_content:
-        css += '\n\n/* Custom styles */\n'
-        css += custom_css_content
+        return _EPUB_CSS + '\n\n/* Custom styles */\n' + custom_css_content
 
-    return css
+    return _EPUB_CSS
 
 
-def create_chapter_file(oebps, filename, div, book_title, renderer, id_map, image_map):
-    """Create an XHTML chapter file using EPUBRenderer."""
-    # Render chapter using EPUBRenderer
-    chapter_html = renderer.render_chapter(div, book_title, id_map)
+def create_chapter_file(div, book_title, renderer, id_map, image_map, chapter_title=None):
+    """Return an XHTML chapter document rendered with EPUBRenderer."""
+    # Render chapter using EPUBRenderer (it maps image src paths itself)
+    return renderer.render_chapter(div, book_title, id_map, image_map, chapter_title)
 
-    # Replace image src paths if needed
-    if image_map:
-        import re
-        def replace_img_src(match):
-            src = match.group(2)
-            new_src = image_map.get(src, src)
-            return match.group(1) + new_src + match.group(3)
-        chapter_html = re.sub(r'(<img[^>]*src=")([^"]+)(")', replace_img_src, chapter_html)
 
-    # Write chapter file
-    with open(os.path.join(oebps, filename), 'w', encoding='utf-8') as f:
-        f.write(chapter_html)
+def create_section_file(section, book_title, renderer, id_map, image_map):
+    """Return an XHTML document for an entire section (body/front/back) without divs."""
+    # Render section using EPUBRenderer (it maps image src paths itself)
+    return renderer.render_section(section, book_title, id_map, image_map)
 
 
-def create_section_file(oebps, filename, section, book_title, renderer, id_map, image_map):
-    """Create an XHTML file from an entire section (body/front/back) without divs."""
-    # Render section using EPUBRenderer
-    section_html = renderer.render_section(section, book_title, id_map)
+def render_sections(sections, chapter_titles, book_title, id_map, image_map,
+                    parallel=True):
+    """
+    Render each section from collect_sections() to an XHTML document.
 
-    # Replace image src paths if needed
-    if image_map:
-        import re
-        def replace_img_src(match):
-            src = match.group(2)
-            new_src = image_map.get(src, src)
-            return match.group(1) + new_src + match.group(3)
-        section_html = re.sub(r'(<img[^>]*src=")([^"]+)(")', replace_img_src, section_html)
-
-    # Write section file
-    with open(os.path.join(oebps, filename), 'w', encoding='utf-8') as f:
-        f.write(section_html)
-
-
-def create_nav_doc(oebps, title, toc_entries):
-    """Create navigation document (nav.xhtml) for EPUB3."""
-    nav = ['<?xml version="1.0" encoding="UTF-8"?>']
-    nav.append('<!DOCTYPE html>')
-    nav.append('<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">')
-    nav.append('<head>')
-    nav.append('  <title>Table of Contents</title>')
-    nav.append('  <link rel="stylesheet" type="text/css" href="styles.css"/>')
-    nav.append('</head>')
-    nav.append('<body>')
-    nav.append('  <nav epub:type="toc" id="toc">')
-    nav.append(f'    <h1>{html.escape(title)}</h1>')
-    nav.append('    <ol>')
-
-    for entry in toc_entries:
-        nav.append(f'      <li><a href="{entry["filename"]}">{html.escape(entry["title"])}</a></li>')
-
-    nav.append('    </ol>')
-    nav.append('  </nav>')
-    nav.append('</body>')
-    nav.append('</html>')
-
-    with open(os.path.join(oebps, 'nav.xhtml'), 'w', encoding='utf-8') as f:
-        f.write('\n'.join(nav))
-
-
-def create_package_doc(oebps, title, book_id, chapters, doc, image_map):
-    """Create package document (content.opf)."""
-    # Extract metadata from TEI header
-    header = doc.find('.//tei:teiHeader', TEI_NS)
-
-    # Get author if available
-    author = 'Unknown'
-    if header is not None:
-        author_elem = header.find('.//tei:author', TEI_NS)
-        if author_elem is not None:
-            author = ''.join(author_elem.itertext()).strip()
-
-    # Get language
-    lang = doc.getroot().get('{http://www.w3.org/1998/namespace}lang', 'en')
-
-    opf = ['<?xml version="1.0" encoding="UTF-8"?>']
-    opf.append('<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id">')
+    chapter_titles holds get_div_title() for each div section, or None for
+    a body without divs, which is rendered whole.
+
+    Documents are yielded one at a time, in section order, so only the
+    chapter being written needs to be held in memory.
+
+    Sections render independently, so larger books are spread across a
+    process pool unless parallel is False. Elements can't be pickled;
+    each section is sent to the workers as serialized XML and re-parsed
+    there. If the pool can't be started or breaks (e.g. a worker is
+    killed), the sections not yet yielded are rendered in this process
+    instead.
+    """
+    done = 0
+    if (parallel and len(sections) >= _PARALLEL_MIN_SECTIONS
+            and (os.cpu_count() or 1) > 1):
+        jobs = [(etree.tostring(section, with_tail=False), chapter_title)
+                for (section, _, _), chapter_title in zip(sections, chapter_titles)]
+        try:
+            with ProcessPoolExecutor(initializer=_init_render_worker,
+                                     initargs=(book_title, id_map, image_map)) as pool:
+                # Workers start as the jobs are submitted; failures surface
+                # either here or while the results are being consumed
+                for section_html in pool.map(_render_serialized_section, jobs, chunksize=4):
+                    yield section_html
+                    done += 1
+            return
+        except (OSError, BrokenProcessPool):
+            pass  # No usable process pool here; render the rest in this process
+
+    renderer = EPUBRenderer()
+    for (section, _, _), chapter_title in islice(zip(sections, chapter_titles), done, None):
+        yield _render_section(renderer, section, chapter_title, book_title, id_map, image_map)
+
+
+def _render_section(renderer, section, chapter_title, book_title, id_map, image_map):
+    """Render one section as a chapter, or whole when chapter_title is None."""
+    if chapter_title is None:
+        return create_section_file(section, book_title, renderer, id_map, image_map)
+    return create_chapter_file(section, book_title, renderer, id_map, image_map,
+                               chapter_title)
+
+
+# Per-process state for render_sections() pool workers
+_worker_state = None
+
+
+def _init_render_worker(book_title, id_map, image_map):
+    """Set up a pool worker with the book-wide rendering inputs."""
+    global _worker_state
+    _worker_state = (EPUBRenderer(), book_title, id_map, image_map)
+
+
+def _render_serialized_section(job):
+    """Pool worker: re-parse a serialized section and render it."""
+    section_xml, chapter_title = job
+    renderer, book_title, id_map, image_map = _worker_state
+    return _render_section(renderer, etree.fromstring(section_xml), chapter_title,
+                           book_title, id_map, image_map)
+
+
+def create_nav_doc(title, toc_entries):
+    """Return the navigation document (nav.xhtml) for EPUB3."""
+    escape = html.escape
+    entries = ''.join(_NAV_ENTRY(entry['filename'], escape(entry['title']))
+                      for entry in toc_entries)
+    return _NAV_DOCUMENT(title=escape(title), entries=entries)
+
+
+def create_package_doc(title, book_id, chapters, metadata, image_map):
+    """Return the package document (content.opf), given get_metadata() results."""
+    author = metadata['author']
+    if author is None:
+        author = 'Unknown'
+    lang = metadata['lang'] or 'en'
 
     # Metadata
-    opf.append('  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">')
-    opf.append(f'    <dc:identifier id="book-id">{book_id}</dc:identifier>')
-    opf.append(f'    <dc:title>{html.escape(title)}</dc:title>')
-    opf.append(f'    <dc:language>{lang}</dc:language>')
-    opf.append(f'    <dc:creator>{html.escape(author)}</dc:creator>')
-    opf.append(f'    <meta property="dcterms:modified">{datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")}</meta>')
+    opf = [_OPF_HEADER(
+        book_id=book_id,
+        title=html.escape(title),
+        lang=lang,
+        author=html.escape(author),
+        modified=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+    )]
+
+    # Manifest (id, href, media type) for each image, shared by the cover
+    # meta and the manifest so the two ids always agree
+    image_items = []
+    if image_map:
+        for new_path in image_map.values():
+            filename = os.path.basename(new_path)
+            ext = os.path.splitext(filename)[1].lower()
+            image_items.append((f"img_{filename.replace('.', '_')}", new_path,
+                                _IMAGE_MIME.get(ext, 'image/png')))
 
     # Add cover metadata if cover image exists
-    if image_map:
-        cover_candidates = ['cover.jpg', 'cover.jpeg', 'cover.png', 'cover.gif']
-        cover_filename = next((path for path in image_map.values() if path in cover_candidates), None)
-        if cover_filename:
-            cover_id = f"img_{cover_filename.replace('.', '_')}"
-            opf.append(f'    <meta name="cover" content="{cover_id}"/>')
+    # (covers are packaged at the top level, so their path is the bare name)
+    cover_id = next((item_id for item_id, path, _ in image_items if path in COVER_FILENAMES), None)
+    if cover_id:
+        opf.append(f'    <meta name="cover" content="{cover_id}"/>')
 
     opf.append('  </metadata>')
 
-    # Manifest
-    opf.append('  <manifest>')
-    opf.append('    <item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>')
-    opf.append('    <item id="css" href="styles.css" media-type="text/css"/>')
-
-    for i, chapter in enumerate(chapters):
-        opf.append(f'    <item id="chapter{i+1}" href="{chapter["filename"]}" media-type="application/xhtml+xml"/>')
+    # Manifest and spine entries for the chapters, built in one pass
+    spine = ['  <spine>']
+    opf.append(_OPF_MANIFEST_HEADER)
+    for i, chapter in enumerate(chapters, 1):
+        opf.append(_OPF_CHAPTER_ITEM(i, chapter['filename']))
+        spine.append(_OPF_ITEMREF(i))
+    spine.append('  </spine>')
 
     # Add images to manifest
-    if image_map:
-        for new_path in image_map.values():
-            filename = os.path.basename(new_path)
-            ext = os.path.splitext(filename)[1].lower()
-            if ext == '.png':
-                media_type = 'image/png'
-            elif ext in ['.jpg', '.jpeg']:
-                media_type = 'image/jpeg'
-            elif ext == '.gif':
-                media_type = 'image/gif'
-            elif ext == '.svg':
-                media_type = 'image/svg+xml'
-            else:
-                media_type = 'image/png'  # default
-            item_id = f"img_{filename.replace('.', '_')}"
-            opf.append(f'    <item id="{item_id}" href="{new_path}" media-type="{media_type}"/>')
+    opf.extend(_OPF_IMAGE_ITEM(*item) for item in image_items)
 
     opf.append('  </manifest>')
 
     # Spine
-    opf.append('  <spine>')
-    for i in range(len(chapters)):
-        opf.append(f'    <itemref idref="chapter{i+1}"/>')
-    opf.append('  </spine>')
+    opf.extend(spine)
 
     opf.append('</package>')
 
-    with open(os.path.join(oebps, 'content.opf'), 'w', encoding='utf-8') as f:
-        f.write('\n'.join(opf))
+    return '\n'.join(opf)
 
-
-def create_epub_archive(temp_dir, output_file):
-    """Create the final EPUB ZIP archive."""
-    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as epub:
-        # Add mimetype first (uncompressed)
-        epub.write(os.path.join(temp_dir, 'mimetype'), 'mimetype', compress_type=zipfile.ZIP_STORED)
-
-        # Add all other files
-        for root, dirs, files in os.walk(temp_dir):
-            for file in files:
-                if file == 'mimetype':
-                    continue
-                filepath = os.path.join(root, file)
-                arcname = os.path.relpath(filepath, temp_dir)
-                epub.write(filepath, arcname)
@@ -6,7 +6,7 @@ TextRenderer implementation. The old implementation is preserved
 in to_text_old.py for reference.
 """
 
-from .common import parse_tei
+from .common import iter_text_parts, atomic_output
 from .renderers.text_renderer import TextRenderer
 from .core.traverser import TEITraverser
 
@@ -20,37 +20,36 @@ def convert(tei_file, output_file, line_width=72):
         output_file: Path to text output file
         line_width: Width for line wrapping (default 72)
     """
-    # Parse the TEI document
-    doc = parse_tei(tei_file)
-
     # Create renderer and traverser
     renderer = TextRenderer(line_width=line_width)
     traverser = TEITraverser(renderer)
 
-    # Render the document
-    result = traverser.traverse_document(doc)
+    # Parse and render the document incrementally, streaming lines straight
+    # to the file, one newline per line, converting non-breaking spaces to
+    # regular spaces as each line is written. The file only replaces
+    # output_file once the whole document has converted.
+    with atomic_output(output_file) as f:
+        write = f.write
+        for result in traverser.traverse_stream(iter_text_parts(tei_file)):
+            if not result:
+                continue
+            for line in _iter_lines(result):
+                write(line.replace('\xa0', ' '))
+                write('\n')
+
+    print(f"Text conversion complete: {output_file}")
+
 
-    # Convert result to lines
+def _iter_lines(result):
+    """Yield the output lines of a rendered piece, flattening nested lists."""
     if isinstance(result, str):
-        output_lines = result.split('\n')
+        yield from result.split('\n')
     elif isinstance(result, list):
-        # Flatten nested lists and convert to strings
-        output_lines = []
         for item in result:
             if isinstance(item, list):
-                output_lines.extend(str(line) for line in item)
+                for line in item:
+                    yield str(line)
             else:
-                output_lines.append(str(item))
+                yield str(item)
     else:
-        output_lines = [str(result)]
-
-    # Write output
-    with open(output_file, 'w', encoding='utf-8') as f:
-        # Convert non-breaking spaces to regular spaces before writing
-        output_text = '\n'.join(output_lines)
-        output_text = output_text.replace('\xa0', ' ')  # Replace non-breaking spaces
-        f.write(output_text)
-        if output_lines:
-            f.write('\n')
-
-    print(f"Text conversion complete: {output_file}")
+        yield str(result)